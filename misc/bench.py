@@ -0,0 +1,137 @@
+import contextlib
+import csv
+import io
+import json
+import math
+import statistics
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from misc.runner import load_solution_class, overrides_solve, timed
+
+# the things we time for each day, in the order they're reported
+STEPS = ("read_input", "part_1", "part_2", "solve")
+
+FIELDS = (
+    "year",
+    "day",
+    "step",
+    "runs",
+    "min_ms",
+    "median_ms",
+    "p95_ms",
+    "mean_ms",
+    "stddev_ms",
+)
+
+
+@dataclass
+class BenchResult:
+    year: int
+    day: int
+    step: str
+    samples_ns: list[int]
+
+    def summary(self) -> dict[str, Any]:
+        samples_ms = sorted(ns / 1_000_000 for ns in self.samples_ns)
+        return {
+            "year": self.year,
+            "day": self.day,
+            "step": self.step,
+            "runs": len(samples_ms),
+            "min_ms": round(samples_ms[0], 4),
+            "median_ms": round(statistics.median(samples_ms), 4),
+            "p95_ms": round(percentile(samples_ms, 95), 4),
+            "mean_ms": round(statistics.fmean(samples_ms), 4),
+            "stddev_ms": round(
+                statistics.stdev(samples_ms) if len(samples_ms) > 1 else 0.0, 4
+            ),
+        }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    nearest-rank percentile of an already-sorted, non-empty list
+    """
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def _has_result(result: Any) -> bool:
+    # `@slow` parts (and unimplemented ones) return None; `solve` returns a tuple of them
+    if isinstance(result, tuple):
+        return any(item is not None for item in result)
+    return result is not None
+
+
+def bench_day(
+    year: int, day: int, runs: int, warmup: int, slow: bool, test_data: bool
+) -> list[BenchResult]:
+    """
+    Times each step of a solution `runs` times, after `warmup` untimed calls.
+
+    Parts that aren't implemented (or are skipped as `@slow`) are left out. The first
+    warm-up call is used to detect that, so there's always at least one.
+    """
+    solution_class = load_solution_class(year, day)
+    solution = solution_class(run_slow=slow, use_test_data=test_data)
+
+    steps: dict[str, Callable[[], Any]] = {
+        "read_input": solution.read_input,
+        "part_1": solution.part_1,
+        "part_2": solution.part_2,
+        "solve": solution.solve,
+    }
+    if overrides_solve(solution_class):
+        del steps["part_1"]
+        del steps["part_2"]
+
+    results: list[BenchResult] = []
+    # solutions are chatty (e.g. `@slow`), but that shouldn't end up in the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        for step in STEPS:
+            if step not in steps:
+                continue
+            func = steps[step]
+
+            try:
+                if not _has_result(func()):
+                    continue
+            except NotImplementedError:
+                continue
+
+            for _ in range(warmup - 1):
+                func()
+
+            samples = [timed(func)[1] for _ in range(runs)]
+            results.append(BenchResult(year, day, step, samples))
+
+    return results
+
+
+def bench_days(
+    days: Iterable[tuple[int, int]],
+    runs: int,
+    warmup: int,
+    slow: bool,
+    test_data: bool,
+) -> list[BenchResult]:
+    # deliberately sequential; running days side by side would skew their timings
+    return [
+        result
+        for (year, day) in days
+        for result in bench_day(year, day, runs, warmup, slow, test_data)
+    ]
+
+
+def write_report(summaries: list[dict[str, Any]], output_format: str):
+    if output_format == "json":
+        json.dump(summaries, sys.stdout, indent=2)
+        print()
+    elif output_format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(summaries)
+    else:
+        raise ValueError(f"Unrecognized output format: {output_format}")
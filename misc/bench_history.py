@@ -0,0 +1,169 @@
+import platform
+import sqlite3
+import subprocess
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).parent.parent
+DEFAULT_DB_PATH = REPO_ROOT / "bench_history.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    git_sha TEXT,
+    python_version TEXT NOT NULL,
+    cpu TEXT NOT NULL,
+    test_data INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    year INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    step TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    min_ms REAL NOT NULL,
+    median_ms REAL NOT NULL,
+    p95_ms REAL NOT NULL,
+    mean_ms REAL NOT NULL,
+    stddev_ms REAL NOT NULL
+);
+"""
+
+RESULT_COLUMNS = (
+    "year",
+    "day",
+    "step",
+    "runs",
+    "min_ms",
+    "median_ms",
+    "p95_ms",
+    "mean_ms",
+    "stddev_ms",
+)
+
+type ResultKey = tuple[int, int, str]
+
+
+def git_sha() -> str | None:
+    """
+    the current commit, suffixed with `-dirty` if there are uncommitted changes
+    """
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "diff", "--quiet", "HEAD"], cwd=REPO_ROOT, check=False
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{sha}-dirty" if dirty.returncode else sha
+
+
+def cpu_info() -> str:
+    cpuinfo = Path("/proc/cpuinfo")
+    if cpuinfo.exists():
+        for line in cpuinfo.read_text().splitlines():
+            if line.startswith("model name"):
+                return line.split(":", 1)[1].strip()
+    return platform.processor() or platform.machine()
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(db_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def save_run(
+    db_path: Path, name: str, summaries: list[dict[str, Any]], test_data: bool
+) -> int:
+    """
+    Stores a set of benchmark summaries (see `BenchResult.summary`) under `name`. Returns the run's id.
+    """
+    # the inner `with` commits the transaction, the outer one closes the connection
+    with closing(connect(db_path)) as connection, connection:
+        cursor = connection.execute(
+            "INSERT INTO runs (name, created_at, git_sha, python_version, cpu, test_data)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                name,
+                datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                git_sha(),
+                platform.python_version(),
+                cpu_info(),
+                int(test_data),
+            ),
+        )
+        run_id = cursor.lastrowid
+        assert run_id is not None
+        connection.executemany(
+            f"INSERT INTO results (run_id, {', '.join(RESULT_COLUMNS)})"
+            f" VALUES (?, {', '.join('?' * len(RESULT_COLUMNS))})",
+            [
+                (run_id, *(summary[column] for column in RESULT_COLUMNS))
+                for summary in summaries
+            ],
+        )
+    return run_id
+
+
+def load_latest_run(
+    db_path: Path, name: str, test_data: bool
+) -> dict[ResultKey, float] | None:
+    """
+    Returns the median times of the most recent run saved as `name` that's comparable with
+    this one (same input data, on the same CPU), or None if there isn't one.
+    """
+    if not db_path.exists():
+        return None
+
+    with closing(connect(db_path)) as connection:
+        row = connection.execute(
+            "SELECT id FROM runs WHERE name = ? AND test_data = ? AND cpu = ?"
+            " ORDER BY id DESC LIMIT 1",
+            (name, int(test_data), cpu_info()),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            (year, day, step): median_ms
+            for (year, day, step, median_ms) in connection.execute(
+                "SELECT year, day, step, median_ms FROM results WHERE run_id = ?", row
+            )
+        }
+
+
+def find_regressions(
+    baseline: dict[ResultKey, float],
+    summaries: list[dict[str, Any]],
+    threshold_pct: float,
+    min_delta_ms: float,
+) -> list[tuple[ResultKey, float, float]]:
+    """
+    Compares median times against a baseline. A step has regressed if it's more than
+    `threshold_pct` percent slower _and_ at least `min_delta_ms` slower, so that tiny
+    steps don't fail the check on noise alone. Steps missing from the baseline are ignored.
+    """
+    regressions: list[tuple[ResultKey, float, float]] = []
+    for summary in summaries:
+        key = (summary["year"], summary["day"], summary["step"])
+        if key not in baseline:
+            continue
+
+        before = baseline[key]
+        after = summary["median_ms"]
+        if (
+            after > before * (1 + threshold_pct / 100)
+            and after - before >= min_delta_ms
+        ):
+            regressions.append((key, before, after))
+    return regressions
@@ -0,0 +1,186 @@
+import contextlib
+import io
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Iterable, Type, cast
+
+from solutions.base import AoCException, BaseSolution, ResultType
+
+SOLUTIONS_DIR = Path(__file__).parent.parent / "solutions"
+
+
+@dataclass
+class PartResult:
+    answer: ResultType = None
+    # None if this part was computed together with the other one by `solve`
+    duration_ns: int | None = None
+
+
+@dataclass
+class DayResult:
+    year: int
+    day: int
+    part_1: PartResult
+    part_2: PartResult
+    # time spent constructing the solution, which includes reading its input
+    setup_ns: int = 0
+    # wall time for the whole day, setup included
+    total_ns: int = 0
+    # set if an `@answer` assertion (or anything else in the solution) failed
+    error: str | None = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "FAIL"
+        if self.part_1.answer is None and self.part_2.answer is None:
+            return "skip"
+        return "ok"
+
+
+def find_days(years: Iterable[str]) -> list[tuple[int, int]]:
+    """
+    Finds every `solutions/<year>/day_NN/solution.py` for the given years, in order.
+    """
+    found: list[tuple[int, int]] = []
+    for year in years:
+        year_dir = SOLUTIONS_DIR / str(year)
+        if not year_dir.is_dir():
+            raise AoCException(f'No solutions found for year {year} in "{year_dir}"')
+
+        found.extend(
+            (int(year), int(match.group(1)))
+            for day_dir in year_dir.iterdir()
+            if (match := re.fullmatch(r"day_(\d+)", day_dir.name))
+            and (day_dir / "solution.py").exists()
+        )
+    return sorted(found)
+
+
+def load_solution_class(year: int, day: int) -> Type[BaseSolution]:
+    return cast(
+        Type[BaseSolution],
+        import_module(f"solutions.{year}.day_{day:02}.solution").Solution,
+    )
+
+
+def overrides_solve(solution_class: Type[BaseSolution]) -> bool:
+    """
+    Whether the solution computes both parts at once, so the parts can't be timed separately.
+    """
+    return solution_class.solve is not BaseSolution.solve
+
+
+def timed[T](func: Callable[[], T]) -> tuple[T, int]:
+    start = perf_counter_ns()
+    result = func()
+    return result, perf_counter_ns() - start
+
+
+def run_day(year: int, day: int, slow: bool, test_data: bool) -> DayResult:
+    """
+    Runs both parts of a single day, timing each of them. Anything the solution prints is discarded.
+    """
+    result = DayResult(year, day, PartResult(), PartResult())
+    start = perf_counter_ns()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            solution_class = load_solution_class(year, day)
+            solution, result.setup_ns = timed(
+                lambda: solution_class(run_slow=slow, use_test_data=test_data)
+            )
+
+            if overrides_solve(solution_class):
+                (p1, p2), duration = timed(solution.solve)
+                result.part_1.answer, result.part_2.answer = p1, p2
+                result.part_1.duration_ns = duration
+            else:
+                for part, func in (
+                    (result.part_1, solution.part_1),
+                    (result.part_2, solution.part_2),
+                ):
+                    part.answer, part.duration_ns = timed(func)
+        except (AoCException, NotImplementedError) as e:
+            result.error = str(e) or type(e).__name__
+        except Exception as e:  # noqa: BLE001
+            # a bug in one day shouldn't hide the results of all the others
+            result.error = f"{type(e).__name__}: {e}"
+
+    result.total_ns = perf_counter_ns() - start
+    return result
+
+
+def run_days(
+    days: Iterable[tuple[int, int]],
+    slow: bool,
+    test_data: bool,
+    workers: int | None = None,
+) -> list[DayResult]:
+    """
+    Runs each (year, day) on a process pool, returning results in the same order.
+    """
+    days = list(days)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                run_day,
+                [year for (year, _) in days],
+                [day for (_, day) in days],
+                [slow] * len(days),
+                [test_data] * len(days),
+            )
+        )
+
+
+def format_seconds(duration_ns: int | None) -> str:
+    if duration_ns is None:
+        return ""
+    return f"{duration_ns / 1_000_000_000:.3f}s"
+
+
+def format_part(part: PartResult, combined: bool) -> tuple[str, str]:
+    answer = "" if part.answer is None else str(part.answer)
+    if combined:
+        return answer, "(both)"
+    return answer, format_seconds(part.duration_ns)
+
+
+def print_table(results: list[DayResult], wall_ns: int):
+    headers = ("Year", "Day", "Part 1", "Time", "Part 2", "Time", "Total", "Status")
+    rows = [
+        (
+            str(r.year),
+            f"{r.day:02}",
+            *format_part(r.part_1, False),
+            *format_part(r.part_2, r.part_2.duration_ns is None and r.error is None),
+            format_seconds(r.total_ns),
+            r.status,
+        )
+        for r in results
+    ]
+    widths = [
+        max(len(cell) for cell in column) for column in zip(headers, *rows, strict=True)
+    ]
+
+    def print_row(cells: Iterable[str]):
+        print("  ".join(cell.ljust(width) for cell, width in zip(cells, widths)))
+
+    print_row(headers)
+    print_row("-" * width for width in widths)
+    for row in rows:
+        print_row(row)
+    print()
+
+    for r in results:
+        if r.error is not None:
+            print(f"ERR: {r.year} day {r.day}: {r.error}")
+
+    print(
+        f"== Ran {len(results)} day(s) in {format_seconds(wall_ns)}"
+        f" (sum of per-day times: {format_seconds(sum(r.total_ns for r in results))})"
+    )
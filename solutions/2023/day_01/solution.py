@@ -2,44 +2,62 @@
 
 # puzzle prompt: https://adventofcode.com/2023/day/1
 
-from ...base import StrSplitSolution, answer
-
-NUMBERS = {
-    "one": "1",
-    "two": "2",
-    "three": "3",
-    "four": "4",
-    "five": "5",
-    "six": "6",
-    "seven": "7",
-    "eight": "8",
-    "nine": "9",
+# We only care about the first and last digit on each line, so we look for each of them
+# directly, with one pattern per end. Both run over the whole (memory-mapped) file, line
+# by line:
+#  - `^.*?(...)` is lazy, so it stops at the first place on the line where a digit starts
+#  - `^.*(...)` is greedy, so it backs off from the end of the line to the last one
+# Looking from each end copes with overlapping words (e.g. "twone") for free.
+# Each line with a digit gives one match to each pattern, so the two stay in step.
+
+import mmap
+import re
+from typing import Dict
+
+from ...base import BytesMmapSolution, answer
+
+DIGITS = {str(n).encode(): n for n in range(10)}
+
+WORDS = {
+    b"one": 1,
+    b"two": 2,
+    b"three": 3,
+    b"four": 4,
+    b"five": 5,
+    b"six": 6,
+    b"seven": 7,
+    b"eight": 8,
+    b"nine": 9,
 }
 
 
-class Solution(StrSplitSolution):
+class Calibrator:
+    def __init__(self, values: Dict[bytes, int]):
+        self.values = values
+        alternatives = b"|".join(re.escape(token) for token in values)
+        self.first = re.compile(rb"^.*?(" + alternatives + rb")", re.MULTILINE)
+        self.last = re.compile(rb"^.*(" + alternatives + rb")", re.MULTILINE)
+
+    def total(self, data: bytes | mmap.mmap) -> int:
+        values = self.values
+        return sum(
+            values[first[1]] * 10 + values[last[1]]
+            for first, last in zip(self.first.finditer(data), self.last.finditer(data))
+        )
+
+
+DIGITS_ONLY = Calibrator(DIGITS)
+DIGITS_AND_WORDS = Calibrator(DIGITS | WORDS)
+
+
+class Solution(BytesMmapSolution):
     _year = 2023
     _day = 1
 
     @answer(54953)
     def part_1(self) -> int:
-        return sum(compute_calibration(line) for line in self.input)
+        return DIGITS_ONLY.total(self.input)
 
     @answer(53868)
     def part_2(self) -> int:
-        return sum(compute_calibration(replace_words(line)) for line in self.input)
-
-
-def replace_words(s: str) -> str:
-    # We should keep the first and last letter of each replaced word to cope
-    # with overlaps with other words.
-    # eightwothree -> eight2othree -> eight2ot3e -> e8t2ot3e
-    for num, digit in NUMBERS.items():
-        s = s.replace(num, f"{num[0]}{digit}{num[-1]}")
-    return s
-
-
-def compute_calibration(s: str) -> int:
-    digits = [c for c in s if c.isdigit()]
-    assert digits, f"No digits in {s}"
-    return int(digits[0] + digits[-1])
+        return DIGITS_AND_WORDS.total(self.input)
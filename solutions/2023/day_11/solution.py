@@ -1,66 +1,73 @@
 # puzzle prompt: https://adventofcode.com/2023/day/11
 
-import re
-from itertools import combinations
-from typing import List, Tuple
+# Rows and columns can be dealt with separately, since the distance is just the sum of
+# the row distance and the column distance.
+#
+# Along one axis, an expanded galaxy coordinate is its original coordinate plus
+# `expansion_size` for every empty line before it (a prefix sum of the empty lines).
+# So the total distance for any expansion size is
+#   (sum of original distances) + expansion_size * (sum of empty lines between each pair)
+# and both of those sums can be worked out once and reused for both parts.
+#
+# The sum of |a - b| over every pair of values doesn't need every pair: once the values
+# are sorted, the i-th one (from 0) is the larger of i pairs and the smaller of n-i-1,
+# so it contributes value * (2i - n + 1).
 
-from ...base import StrSplitSolution, answer
+import numpy as np
+from numpy.typing import NDArray
 
+from ...base import CharGridSolution, answer, parse_once
 
-class Grid:
-    def __init__(self, lines: List[str]):
-        self._rows_to_expand = [
-            row for (row, line) in enumerate(lines) if re.match("^\\.+$", line)
-        ]
-
-        self._cols_to_expand = [
-            col for col in range(len(lines[0])) if all(row[col] == "." for row in lines)
-        ]
-
-        self._lines = lines
-        self._rows = len(lines)
-        self._cols = len(lines[0])
-
-    def galaxies(self):
-        for r in range(self._rows):
-            for c in range(self._cols):
-                if self._lines[r][c] != ".":
-                    yield (r, c)
-
-    def distance(self, p1: Tuple[int, int], p2: Tuple[int, int], expansion_size: int):
-        """Computes the distance between two points, treating expansion rows and columns to be of the specified size."""
-        (r1, c1) = p1
-        (r2, c2) = p2
-
-        [ra, rb] = order(r1, r2)
-        [ca, cb] = order(c1, c2)
+EMPTY = ord(".")
 
-        extra_rows = sum(1 for row in self._rows_to_expand if ra <= row <= rb)
-        extra_cols = sum(1 for col in self._cols_to_expand if ca <= col <= cb)
 
-        return abs(r1 - r2) + abs(c1 - c2) + (extra_rows + extra_cols) * expansion_size
+def sum_of_pairwise_distances(sorted_values: NDArray[np.int64]) -> int:
+    n = len(sorted_values)
+    weights = 2 * np.arange(n, dtype=np.int64) - n + 1
+    return int(sorted_values @ weights)
 
 
-def order(i1: int, i2: int):
-    return [i1, i2] if i1 <= i2 else [i2, i1]
-
-
-class Solution(StrSplitSolution):
+class Grid:
+    def __init__(self, cells: NDArray[np.uint8]):
+        empty = cells == EMPTY
+
+        # how many empty rows/cols come before (or at) each index
+        empty_rows_before = np.cumsum(empty.all(axis=1))
+        empty_cols_before = np.cumsum(empty.all(axis=0))
+
+        # row-major order, so the rows are already sorted, but the cols need sorting
+        rows, cols = np.nonzero(~empty)
+        cols = np.sort(cols)
+
+        self._original_distance = 0
+        self._empty_lines_crossed = 0
+        for coords, empty_lines_before in [
+            (rows, empty_rows_before),
+            (cols, empty_cols_before),
+        ]:
+            self._original_distance += sum_of_pairwise_distances(coords)
+            # the prefix sums never go down, so these are sorted too
+            self._empty_lines_crossed += sum_of_pairwise_distances(
+                empty_lines_before[coords]
+            )
+
+    def total_distance(self, expansion_size: int) -> int:
+        """The sum of the distances between every pair of galaxies, treating expansion rows and columns to be of the specified size."""
+        return self._original_distance + self._empty_lines_crossed * expansion_size
+
+
+class Solution(CharGridSolution):
     _year = 2023
     _day = 11
 
+    @parse_once
+    def parse(self) -> Grid:
+        return Grid(self.input)
+
     @answer(9445168)
     def part_1(self) -> int:
-        grid = Grid(self.input)
-        galaxies = list(grid.galaxies())
-
-        return sum(grid.distance(g1, g2, 1) for (g1, g2) in combinations(galaxies, 2))
+        return self.parse().total_distance(1)
 
     @answer(742305960572)
     def part_2(self) -> int:
-        grid = Grid(self.input)
-        galaxies = list(grid.galaxies())
-
-        return sum(
-            grid.distance(g1, g2, 999999) for (g1, g2) in combinations(galaxies, 2)
-        )
+        return self.parse().total_distance(999999)
@@ -1,38 +1,37 @@
 # puzzle prompt: https://adventofcode.com/2024/day/1
 
-from collections import Counter
+# Both columns are read in one go, and sorted once for both parts.
+# For part 2, sorting means each number in the right list only needs counting once
+# (`np.unique`), and each number in the left list can find its count with a binary search.
 
-from ...base import StrSplitSolution, answer
+from typing import Tuple
 
+import numpy as np
+from numpy.typing import NDArray
 
-class Solution(StrSplitSolution):
+from ...base import TextSolution, answer, parse_once
+
+
+class Solution(TextSolution):
     _year = 2024
     _day = 1
 
-    def input_tuples(self):
-        split_lines = (line.split() for line in self.input)
-        return [(int(line[0]), int(line[1])) for line in split_lines]
-
-    def input_lists(self):
-        input_tuples = self.input_tuples()
-        first_list = [n1 for (n1, n2) in input_tuples]
-        second_list = [n2 for (n1, n2) in input_tuples]
-        return (first_list, second_list)
+    @parse_once
+    def sorted_lists(self) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        # whitespace of any sort separates the numbers, so the pairs come out in order
+        numbers = np.fromstring(self.input, dtype=np.int64, sep=" ").reshape(-1, 2)
+        return (np.sort(numbers[:, 0]), np.sort(numbers[:, 1]))
 
     @answer(1320851)
     def part_1(self) -> int:
-        (first_list, second_list) = self.input_lists()
-
-        first_list.sort()
-        second_list.sort()
-
-        differences = (abs(n1 - n2) for (n1, n2) in zip(first_list, second_list))
-        return sum(differences)
+        (first_list, second_list) = self.sorted_lists()
+        return int(np.abs(first_list - second_list).sum())
 
     @answer(26859182)
     def part_2(self) -> int:
-        (first_list, second_list) = self.input_lists()
+        (first_list, second_list) = self.sorted_lists()
 
-        second_list_counts = Counter(second_list)
-        counts = (item * second_list_counts[item] for item in first_list)
-        return sum(counts)
+        values, counts = np.unique(second_list, return_counts=True)
+        indexes = np.searchsorted(values, first_list).clip(max=len(values) - 1)
+        in_second_list = values[indexes] == first_list
+        return int(first_list[in_second_list] @ counts[indexes[in_second_list]])
@@ -1,52 +1,82 @@
 # puzzle prompt: https://adventofcode.com/2024/day/2
 
-from itertools import pairwise
-from typing import List
+# Reports of the same length are stacked into one 2-D array, so every report in the
+# stack is checked at once. The lines are streamed in batches, so memory stays flat
+# however many reports there are.
+#
+# For part 2, we don't need to try removing every level. For a given direction, find the
+# first step between two levels that's bad: removing any level before or after that pair
+# leaves the bad step in place, so the only candidates are the two levels either side of
+# it.
 
-from ...base import StrSplitSolution, answer
+from itertools import batched
+from typing import Dict, Iterable, List, Tuple
 
+import numpy as np
+from numpy.typing import NDArray
 
-class Solution(StrSplitSolution):
-    _year = 2024
-    _day = 2
-
-    @answer(534)
-    def part_1(self) -> int:
-        reports = [parse_report(line) for line in self.input]
-        return sum(1 if is_safe(report) else 0 for report in reports)
-
-    @answer(577)
-    def part_2(self) -> int:
-        reports = [parse_report(line) for line in self.input]
-        return sum(
-            1 if is_safe(report) or can_be_made_safe(report) else 0
-            for report in reports
-        )
-
-
-def is_safe(levels: List[int]) -> bool:
-    diffs = [a - b for (a, b) in pairwise(levels)]
-    diffs_are_correctly_sized = all(1 <= abs(diff) <= 3 for diff in diffs)
+from ...base import LineStreamSolution, answer
 
-    direction = sign(diffs[0])
-    is_monotonic = all(sign(diff) == direction for diff in diffs)
+DIRECTIONS = (1, -1)
+REPORTS_PER_BATCH = 4096
 
-    return diffs_are_correctly_sized and is_monotonic
-
-
-def can_be_made_safe(levels: List[int]) -> bool:
-    for i in range(len(levels)):
-        modified_levels = levels.copy()
-        del modified_levels[i]
-        if is_safe(modified_levels):
-            return True
-    return False
-
-
-def parse_report(line: str) -> List[int]:
-    # """Parses '1 2 3 4' into [1,2,3,4]"""
-    return [int(segment) for segment in line.split()]
 
+class Solution(LineStreamSolution):
+    _year = 2024
+    _day = 2
 
-def sign(num: int):
-    return -1 if num < 0 else 1
+    @answer((534, 577))
+    def solve(self) -> tuple[int, int]:
+        safe = 0
+        safe_with_removal = 0
+        for batch in batched(self.input, REPORTS_PER_BATCH):
+            for reports in group_by_length(batch):
+                (group_safe, group_safe_with_removal) = count_safe(reports)
+                safe += group_safe
+                safe_with_removal += group_safe_with_removal
+        return (safe, safe_with_removal)
+
+
+def group_by_length(lines: Iterable[str]) -> List[NDArray[np.int64]]:
+    """Parses each line of levels, stacking reports of the same length into one array"""
+    groups: Dict[int, List[List[int]]] = {}
+    for line in lines:
+        levels = [int(segment) for segment in line.split()]
+        groups.setdefault(len(levels), []).append(levels)
+    return [np.array(reports, dtype=np.int64) for reports in groups.values()]
+
+
+def good_steps(reports: NDArray[np.int64], direction: int) -> NDArray[np.bool_]:
+    """Whether each step between neighbouring levels is a safe step in the direction"""
+    steps = np.diff(reports, axis=1) * direction
+    return (steps >= 1) & (steps <= 3)
+
+
+def without_level(
+    reports: NDArray[np.int64], removed: NDArray[np.intp]
+) -> NDArray[np.int64]:
+    """Each report with the level at its index in `removed` taken out"""
+    columns = np.arange(reports.shape[1] - 1)
+    columns = columns + (columns >= removed[:, np.newaxis])
+    return np.take_along_axis(reports, columns, axis=1)
+
+
+def count_safe(reports: NDArray[np.int64]) -> Tuple[int, int]:
+    """
+    How many of the reports are safe as they are, and how many are (or can be made) safe
+    by removing at most one level
+    """
+    safe = np.zeros(len(reports), dtype=np.bool_)
+    fixable = np.zeros(len(reports), dtype=np.bool_)
+
+    for direction in DIRECTIONS:
+        good = good_steps(reports, direction)
+        safe |= good.all(axis=1)
+
+        # for safe reports this is 0, but they're already counted anyway
+        first_bad = good.argmin(axis=1)
+        for removed in (first_bad, first_bad + 1):
+            fixed = good_steps(without_level(reports, removed), direction)
+            fixable |= fixed.all(axis=1)
+
+    return (int(np.count_nonzero(safe)), int(np.count_nonzero(safe | fixable)))
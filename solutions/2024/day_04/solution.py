@@ -1,103 +1,77 @@
 # puzzle prompt: https://adventofcode.com/2024/day/4
 
-from itertools import zip_longest
-from typing import Iterable, Tuple
+# Rather than walking out from every cell, we compare whole shifted views of the grid:
+# for a word read along (dr, dc), letter k of every possible match sits in the view
+# shifted by k steps, so one comparison per letter checks every starting cell at once.
+#
+# Reading "XMAS" backwards along a line is the same as reading "SAMX" forwards, so we
+# only need 4 of the 8 directions if we search for both spellings.
+#
+# Part 2 works the same way, with views offset diagonally around every "A".
 
-from ...base import StrSplitSolution, answer
+import numpy as np
+from numpy.typing import NDArray
 
-DIRECTIONS = [
-    (dr, dc) for dr in range(-1, 2) for dc in range(-1, 2) if dr != 0 or dc != 0
-]
+from ...base import CharGridSolution, answer
 
+# right, down, down-right, down-left
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
 
-class Grid:
-    def __init__(self, data: list[str]):
-        self._data = [list(line) for line in data]
-        self.height = len(self._data)
-        self.width = len(self._data[0])
+M = ord("M")
+A = ord("A")
+S = ord("S")
 
-    def _out_of_range(self, row: int, col: int) -> bool:
-        return row < 0 or col < 0 or row >= self.height or col >= self.width
 
-    def get(self, row: int, col: int) -> str | None:
-        if self._out_of_range(row, col):
-            return None
-        return self._data[row][col]
+def count_in_direction(
+    cells: NDArray[np.uint8], word: bytes, direction: tuple[int, int]
+) -> int:
+    """How many times the word appears when reading along the direction"""
+    (dr, dc) = direction
+    height, width = cells.shape
+    span = len(word) - 1
 
-    def is_xmas(self, pos: Tuple[int, int]) -> bool:
-        (row, col) = pos
-        if self.get(row, col) == "A":
-            tl = self.get(row - 1, col - 1)
-            if tl != "M" and tl != "S":
-                return False
-            if self.get(row + 1, col + 1) != opposite_xmas(tl):
-                return False
+    # the starting cells that leave room for the whole word
+    first_col = span if dc < 0 else 0
+    rows = height - abs(dr) * span
+    cols = width - abs(dc) * span
+    if rows <= 0 or cols <= 0:
+        return 0
 
-            tr = self.get(row - 1, col + 1)
-            if tr != "M" and tr != "S":
-                return False
-            return self.get(row + 1, col - 1) == opposite_xmas(tr)
-        return False
+    found = np.ones((rows, cols), dtype=np.bool_)
+    for k, letter in enumerate(word):
+        row = k * dr
+        col = first_col + k * dc
+        found &= cells[row : row + rows, col : col + cols] == letter
+    return int(np.count_nonzero(found))
 
-    def positions(self):
-        """Returns all the positions in the grid"""
-        for r in range(self.height):
-            for c in range(self.width):
-                yield (r, c)
 
-    def follow_direction(self, pos: Tuple[int, int], delta: Tuple[int, int]):
-        """Returns all the positions available from a point, in a specified direction"""
-        (row, col) = pos
-        (dr, dc) = delta
+def is_mas(end1: NDArray[np.uint8], end2: NDArray[np.uint8]) -> NDArray[np.bool_]:
+    """Whether each pair of opposite corners reads "MAS" (in either direction)"""
+    return ((end1 == M) & (end2 == S)) | ((end1 == S) & (end2 == M))
 
-        while True:
-            ch = self.get(row, col)
-            if ch is None:
-                break
-            else:
-                yield ch
-                row += dr
-                col += dc
 
-
-def opposite_xmas(ch: str):
-    return "M" if ch == "S" else "S"
-
-
-def matches(iter1: Iterable[str], iter2: Iterable[str]) -> bool:
-    return all(a == b for (a, b) in zip_longest(iter1, iter2, fillvalue=None))
-
-
-# TODO: is there not a version of this built into Python?
-def take[T](it: Iterable[T], count: int):
-    for i in it:
-        if count == 0:
-            return
-        count -= 1
-        yield i
-
-
-class Solution(StrSplitSolution):
+class Solution(CharGridSolution):
     _year = 2024
     _day = 4
 
-    @answer(2507)
-    def part_1(self) -> int:
-        grid = Grid(self.input)
-        search = list("XMAS")
-        search_length = len(search)
+    @answer((2507, 1969))
+    def solve(self) -> tuple[int, int]:
+        cells = self.input
 
-        return sum(
-            1
-            for start_pos in grid.positions()
+        xmas_count = sum(
+            count_in_direction(cells, word, direction)
             for direction in DIRECTIONS
-            if matches(
-                search,
-                take(grid.follow_direction(start_pos, direction), search_length),
-            )
+            for word in (b"XMAS", b"SAMX")
+        )
+
+        # every cell with a neighbour on each side
+        centres = cells[1:-1, 1:-1]
+        top_left, top_right = cells[:-2, :-2], cells[:-2, 2:]
+        bottom_left, bottom_right = cells[2:, :-2], cells[2:, 2:]
+        x_mas = (
+            (centres == A)
+            & is_mas(top_left, bottom_right)
+            & is_mas(top_right, bottom_left)
         )
 
-    @answer(1969)
-    def part_2(self) -> int:
-        grid = Grid(self.input)
-        return sum(1 for position in grid.positions() if grid.is_xmas(position))
+        return xmas_count, int(np.count_nonzero(x_mas))
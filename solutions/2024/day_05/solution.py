@@ -1,50 +1,89 @@
 # puzzle prompt: https://adventofcode.com/2024/day/5
 
+# It would be nice to be able to do a single topological sort across all the rules, but
+# unfortunately the rules form a _cyclic_ graph. However, in the puzzle input every pair
+# of pages within an update has a rule of its own, so the rules give a consistent order
+# for the pages of any one update. That means:
+#  - an update is in order exactly when each page is allowed before the one after it
+#  - an incorrect update can be fixed with an ordinary sort, comparing pages by the rules
+# Both of those are checked as we go: if two neighbouring pages have no rule between
+# them, we fall back to checking every pair, and to a topological sort of the rules that
+# apply to the update.
+
+from functools import cmp_to_key
 from graphlib import TopologicalSorter
-from typing import Iterable, List, Set, Tuple
-
-from ...base import StrSplitSolution, answer
-
-
-class Rule:
-    def __init__(self, before: int, after: int):
-        self.before = before
-        self.after = after
-
-
-class Update:
-    def __init__(self, pages: List[int]):
-        self.pages = pages
+from typing import Dict, List, Set, Tuple
+
+from ...base import StrSplitSolution, answer, parse_once
+
+
+class Rules:
+    def __init__(self):
+        # page -> the pages that must come after it
+        self._later: Dict[int, Set[int]] = {}
+        # in the order they were given, for the fallback topological sort
+        self._rules: List[Tuple[int, int]] = []
+
+    def add(self, before: int, after: int):
+        self._later.setdefault(before, set()).add(after)
+        self._rules.append((before, after))
+
+    def must_precede(self, page1: int, page2: int) -> bool:
+        return page2 in self._later.get(page1, ())
+
+    def compare(self, page1: int, page2: int) -> int:
+        if self.must_precede(page1, page2):
+            return -1
+        if self.must_precede(page2, page1):
+            return 1
+        return 0
+
+    def has_rule(self, page1: int, page2: int) -> bool:
+        return self.must_precede(page1, page2) or self.must_precede(page2, page1)
+
+    def is_ordered(self, pages: List[int]) -> bool:
+        neighbours = list(zip(pages, pages[1:]))
+        if all(self.has_rule(page1, page2) for page1, page2 in neighbours):
+            return not any(
+                self.must_precede(page2, page1) for page1, page2 in neighbours
+            )
+
+        # some neighbours aren't covered by a rule, so any pair of pages might break one
+        return not any(
+            self.must_precede(later_page, earlier_page)
+            for index, earlier_page in enumerate(pages)
+            for later_page in pages[index + 1 :]
+        )
 
-        # Compute the rules which would be problematic for this update
-        prohibited_rules: Set[Tuple[int, int]] = set()
+    def ordered(self, pages: List[int]) -> List[int]:
+        result = sorted(pages, key=cmp_to_key(self.compare))
+        if all(
+            self.must_precede(page1, page2) for page1, page2 in zip(result, result[1:])
+        ):
+            return result
 
-        # e.g. for 1,2,3, we can look at 1 and see that (2,1) and (3,1) would be problematic. And then (3,2)
-        for index, earlier_page in enumerate(pages):
-            for later_page in pages[index + 1 :]:
-                prohibited_rules.add((later_page, earlier_page))
-        self._prohibited_rules = prohibited_rules
+        # The rules don't order every pair of these pages, so the comparison isn't
+        # transitive and the sort can't be trusted. Sort the pages the rules mention.
+        page_set = set(pages)
+        sorter = TopologicalSorter()
+        for before, after in self._rules:
+            if before in page_set and after in page_set:
+                sorter.add(after, before)
+        return list(sorter.static_order())
 
-    def satisfies_rules(self, rules: Iterable[Rule]):
-        matches = (
-            (rule.before, rule.after) not in self._prohibited_rules for rule in rules
-        )
-        return all(matches)
 
-    def middle_page(self):
-        return self.pages[(len(self.pages) - 1) // 2]
-
-    def __repr__(self):
-        return f"{self.pages}"
+def middle_page(pages: List[int]) -> int:
+    return pages[(len(pages) - 1) // 2]
 
 
 class Solution(StrSplitSolution):
     _year = 2024
     _day = 5
 
-    def parse_input(self):
-        rules: List[Rule] = []
-        updates: List[Update] = []
+    @parse_once
+    def parse_input(self) -> Tuple[Rules, List[List[int]]]:
+        rules = Rules()
+        updates: List[List[int]] = []
 
         reading_rules = True
 
@@ -54,42 +93,23 @@ class Solution(StrSplitSolution):
                 continue
             if reading_rules:
                 [before, after] = [int(segment) for segment in line.split("|")]
-                rules.append(Rule(before, after))
+                rules.add(before, after)
             else:
-                pages = [int(segment) for segment in line.split(",")]
-                updates.append(Update(pages))
+                updates.append([int(segment) for segment in line.split(",")])
 
         return (rules, updates)
 
-    @answer(5064)
-    def part_1(self) -> int:
-        (rules, updates) = self.parse_input()
-
-        good_updates = (update for update in updates if update.satisfies_rules(rules))
-        middle_pages = (update.middle_page() for update in good_updates)
-        return sum(middle_pages)
-
-    @answer(5152)
-    def part_2(self) -> int:
-        # It would be nice to be able to do a single topological sort across all the rules
-        # but unfortunately the rules form a _cyclic_ graph. So we do a tsort of the subset
-        # of nodes that actually pertain to each Update.
+    @answer((5064, 5152))
+    def solve(self) -> tuple[int, int]:
         (rules, updates) = self.parse_input()
 
-        incorrect_updates = [
-            update for update in updates if not update.satisfies_rules(rules)
-        ]
-
-        total = 0
+        correct_total = 0
+        fixed_total = 0
 
-        for update in incorrect_updates:
-            pages = set(update.pages)
-            sorter = TopologicalSorter()
-            for rule in rules:
-                if rule.before in pages and rule.after in pages:
-                    sorter.add(rule.after, rule.before)
-            sorted_pages = list(sorter.static_order())
-            sorted_update = Update(sorted_pages)
-            total += sorted_update.middle_page()
+        for pages in updates:
+            if rules.is_ordered(pages):
+                correct_total += middle_page(pages)
+            else:
+                fixed_total += middle_page(rules.ordered(pages))
 
-        return total
+        return (correct_total, fixed_total)
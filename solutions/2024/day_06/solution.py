@@ -1,87 +1,161 @@
 # puzzle prompt: https://adventofcode.com/2024/day/6
 
-from concurrent.futures import ProcessPoolExecutor
-from enum import Enum
-from typing import Dict, List, Tuple
+from typing import List, Tuple
 
 from ...base import StrSplitSolution, answer
+from ...utils.parallel import map_chunks
 
-type Position = Tuple[int, int]
+# Cells are addressed by their flat index (row * width + col), and directions by
+# number: 0 = up, 1 = right, 2 = down, 3 = left. Turning right is (dir + 1) % 4.
 
-DIRECTIONS: List[Position] = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+# Rather than stepping one cell at a time, the guard uses a jump table that says where
+# she'll stop when walking in each direction from each cell: the cell in front of the
+# next obstacle, or EXIT if she'd walk off the map. A candidate obstruction only
+# matters when it's on the segment she's about to walk, which is cheap to check.
 
+# A loop is detected when she stops at the same cell facing the same way twice, which
+# is tracked in a bytearray with one entry per (cell, direction).
 
-# The state of a guard
-class GuardState(Enum):
-    FREELY_MOVING = 1
-    EXITED_MAZE = 2
-    DETECTED_LOOP = 3
+# An extra obstruction can't change anything until the guard first reaches its cell,
+# so each candidate is simulated from the state the original route was in just before
+# that point, rather than from the start.
+
+EXIT = -1
+
+# (cell, the cell the guard stepped in from, the direction she was facing)
+type FirstVisit = Tuple[int, int, int]
 
 
 class Maze:
     def __init__(self, lines: List[str]):
-        self.lines = lines
         self.height = len(lines)
         self.width = len(lines[0])
 
-
-class Guard:
-    def __init__(self, maze: Maze, obstruction_pos: Position | None = None):
-        self.maze = maze
-        self.dir = 0
-        self.state = GuardState.FREELY_MOVING
-        self.obstruction_pos = obstruction_pos
-
-        self.row = [
-            index for (index, line) in enumerate(maze.lines) if line.find("^") >= 0
-        ][0]
-        self.col = maze.lines[self.row].find("^")
-
-        self.visited_count: Dict[Position, int] = {}
-        self.visited_count[(self.row, self.col)] = 1
-
-    def next_position(self) -> Position | None:
-        (delta_row, delta_col) = DIRECTIONS[self.dir]
-        next_row = self.row + delta_row
-        next_col = self.col + delta_col
-
-        if next_row < 0 or next_col < 0:
-            return None
-        if next_row >= self.maze.height or next_col >= self.maze.width:
-            return None
-        return (next_row, next_col)
-
-    def move(self):
-        next_pos = self.next_position()
-        if next_pos is None:
-            self.state = GuardState.EXITED_MAZE
-            return
-
-        (next_row, next_col) = next_pos
-        item_in_front = self.maze.lines[next_row][next_col]
-
-        if item_in_front == "#" or next_pos == self.obstruction_pos:
-            # Blocked, so turn and try again
-            self.dir = (self.dir + 1) % len(DIRECTIONS)
-            self.move()
-            return
-
-        self.row = next_row
-        self.col = next_col
-        new_count = self.visited_count.get(next_pos, 0) + 1
-        self.visited_count[next_pos] = new_count
-        if new_count > 4:
-            # Cycle
-            self.state = GuardState.DETECTED_LOOP
-
-    def move_until_exit(self):
-        while self.state == GuardState.FREELY_MOVING:
-            self.move()
-
-
-def guard_loops(guard: Guard):
-    guard.move_until_exit()
-    return 1 if guard.state == GuardState.DETECTED_LOOP else 0
+        cells = "".join(lines)
+        self.blocked = bytearray(ch == "#" for ch in cells)
+        self.start = cells.index("^")
+        self.steps = [-self.width, 1, self.width, -1]
+
+        size = len(cells)
+        self.jumps = [[EXIT] * size for _ in range(4)]
+
+        rows = range(self.height)
+        cols = range(self.width)
+        # each line of cells, ordered from the end the guard would be walking towards
+        for direction, lines_of_cells in enumerate(
+            [
+                ([r * self.width + c for r in rows] for c in cols),
+                ([r * self.width + c for c in reversed(cols)] for r in rows),
+                ([r * self.width + c for r in reversed(rows)] for c in cols),
+                ([r * self.width + c for c in cols] for r in rows),
+            ]
+        ):
+            jumps = self.jumps[direction]
+            for line in lines_of_cells:
+                stop = EXIT
+                after_obstacle = False
+                for cell in line:
+                    if self.blocked[cell]:
+                        after_obstacle = True
+                        continue
+                    if after_obstacle:
+                        stop = cell
+                        after_obstacle = False
+                    jumps[cell] = stop
+
+    def first_visits(self) -> List[FirstVisit]:
+        """
+        Walks the guard's original route, returning the first visit to each cell (other
+        than the start), in order
+        """
+        seen = bytearray(len(self.blocked))
+        seen[self.start] = 1
+        stopped_at = bytearray(len(self.blocked) * 4)
+        visited: List[FirstVisit] = []
+
+        cell = self.start
+        direction = 0
+        while True:
+            stop = self.jumps[direction][cell]
+            step = self.steps[direction]
+            # walk to the stop (or the edge of the map), one cell at a time
+            while cell != stop and self.in_bounds(cell, direction):
+                cell += step
+                if not seen[cell]:
+                    seen[cell] = 1
+                    visited.append((cell, cell - step, direction))
+            # (real inputs never loop, but that's no reason to hang if one does)
+            if stop == EXIT or stopped_at[stop * 4 + direction]:
+                return visited
+            stopped_at[stop * 4 + direction] = 1
+            direction = (direction + 1) % 4
+
+    def in_bounds(self, cell: int, direction: int) -> bool:
+        """Whether there's another cell beyond this one in the given direction"""
+        row, col = divmod(cell, self.width)
+        if direction == 0:
+            return row > 0
+        if direction == 1:
+            return col < self.width - 1
+        if direction == 2:
+            return row < self.height - 1
+        return col > 0
+
+    def loops_with_obstruction(self, visit: FirstVisit) -> bool:
+        """
+        Whether the guard ends up in a loop if there's an extra obstruction in the visited
+        cell, picking up the original route just before she'd walk into it
+        """
+        obstruction, cell, direction = visit
+        width = self.width
+        jumps = self.jumps
+        steps = self.steps
+        o_row, o_col = divmod(obstruction, width)
+        stopped_at = bytearray(len(self.blocked) * 4)
+
+        while True:
+            stop = jumps[direction][cell]
+
+            # Is the obstruction between here and where we'd otherwise stop?
+            row, col = divmod(cell, width)
+            if direction == 0:
+                blocks = o_col == col and o_row < row
+                blocks = blocks and (stop == EXIT or o_row >= stop // width)
+            elif direction == 1:
+                blocks = o_row == row and o_col > col
+                blocks = blocks and (stop == EXIT or o_col <= stop % width)
+            elif direction == 2:
+                blocks = o_col == col and o_row > row
+                blocks = blocks and (stop == EXIT or o_row <= stop // width)
+            else:
+                blocks = o_row == row and o_col < col
+                blocks = blocks and (stop == EXIT or o_col >= stop % width)
+
+            if blocks:
+                stop = obstruction - steps[direction]
+            elif stop == EXIT:
+                return False
+
+            state = stop * 4 + direction
+            if stopped_at[state]:
+                return True
+            stopped_at[state] = 1
+
+            cell = stop
+            direction = (direction + 1) % 4
+
+
+# Each worker process gets the maze once, when it starts, rather than with every task
+_worker_maze: Maze
+
+
+def _init_worker(maze: Maze):
+    global _worker_maze
+    _worker_maze = maze
+
+
+def count_loops(visits: List[FirstVisit]) -> int:
+    return sum(1 for visit in visits if _worker_maze.loops_with_obstruction(visit))
 
 
 class Solution(StrSplitSolution):
@@ -91,26 +165,17 @@ class Solution(StrSplitSolution):
     @answer((4826, 1721))
     def solve(self) -> tuple[int, int]:
         maze = Maze(self.input)
+        visits = maze.first_visits()
 
-        original_guard = Guard(maze)
-        original_guard.move_until_exit()
-
-        # Now we've computed the original path, consider turning
-        # all of the visited positions into obstructions.
+        # An obstruction can only change anything if it's somewhere on the original
+        # route (and it can't go where the guard starts).
         # (This means we consider about 5000 positions instead of all 17000)
-        # We could go even faster by reusing large portions of the path,
-        # knowing that the path will be the same up until the first time we hit
-        # each position.
 
-        # Create a series of guards with an extra obstruction in place
-        guards_with_obstructions = (
-            Guard(maze, pos) for pos in original_guard.visited_count
+        # Spread the candidates over the workers in a few chunks each, so that we're
+        # only sending tuples of ints back and forth.
+        obstructions_causing_loops = sum(
+            map_chunks(count_loops, visits, initializer=_init_worker, initargs=(maze,))
         )
 
-        # And run them in parallel. :-)
-        with ProcessPoolExecutor() as executor:
-            obstructions_causing_loops = sum(
-                executor.map(guard_loops, guards_with_obstructions)
-            )
-
-        return len(original_guard.visited_count), obstructions_causing_loops
+        # +1 for the start, which isn't a candidate
+        return len(visits) + 1, obstructions_causing_loops
@@ -3,13 +3,21 @@
 from typing import List, Tuple
 
 from ...base import StrSplitSolution, answer
+from ...utils.parallel import map_chunks
 
 # Our main observation for this puzzle is that because we're only expecting integers,
 # we can rule out multiplication operations if the division result isn't integral.
 # e.g. if we have 292: 11 6 16 20, we KNOW that the last operation can't be a multiply
 # because no integer muliplied by 20 would give 292.
 # This means we process the numbers _backwards_.
-# This also makes concatenation-testing trivial.
+# This also makes concatenation-testing trivial: 156 can only end in `|| 6` if
+# 156 - 6 is a multiple of 10 (the power of ten just above 6).
+#
+# All the numbers are positive, and none of the operators make a number smaller, so
+# once the remaining total is less than the number we're undoing, that branch is dead.
+#
+# Every equation that part 1 can solve is also solved in part 2, so part 2 only needs
+# to look at the ones part 1 couldn't do.
 
 type Equation = Tuple[int, List[int]]
 
@@ -18,63 +26,75 @@ class Solution(StrSplitSolution):
     _year = 2024
     _day = 7
 
-    def _read_equations(self):
-        return [parse_line(line) for line in self.input]
+    @answer((303766880536, 337041851384440))
+    def solve(self) -> tuple[int, int]:
+        equations = [parse_line(line) for line in self.input]
 
-    @answer(303766880536)
-    def part_1(self) -> int:
-        return self._compute(allow_concatenation=False)
+        # Each worker takes a few chunks, working out both parts for its equations
+        results = map_chunks(solve_equations, equations)
 
-    @answer(337041851384440)
-    def part_2(self) -> int:
-        return self._compute(allow_concatenation=True)
+        part_1 = sum(p1 for (p1, _) in results)
+        return part_1, part_1 + sum(p2_extra for (_, p2_extra) in results)
 
-    def _compute(self, allow_concatenation: bool) -> int:
-        return sum(
-            total
-            for (total, nums) in self._read_equations()
-            if has_solutions(total, nums, allow_concatenation=allow_concatenation)
-        )
 
+def solve_equations(equations: List[Equation]) -> Tuple[int, int]:
+    """
+    Returns the total of the equations that can be solved without concatenation, and the
+    total of those that can only be solved with it
+    """
+    without_concatenation = 0
+    only_with_concatenation = 0
+    for total, nums in equations:
+        if has_solutions(total, nums, allow_concatenation=False):
+            without_concatenation += total
+        elif has_solutions(total, nums, allow_concatenation=True):
+            only_with_concatenation += total
+    return without_concatenation, only_with_concatenation
 
-def has_solutions(
-    original_total: int, all_nums: List[int], allow_concatenation: bool
-) -> bool:
-    def inner_test(total: int, nums: List[int]) -> bool:
-        if len(nums) == 1:
-            return nums[0] == total
 
-        [first, *rest] = nums
+def has_solutions(total: int, nums: List[int], allow_concatenation: bool) -> bool:
+    # the smallest power of ten greater than each number, for undoing concatenations
+    powers = [next_power_of_ten(num) for num in nums] if allow_concatenation else []
+
+    # (index of the last number not yet undone, the total that the numbers up to and
+    # including it would need to make)
+    stack = [(len(nums) - 1, total)]
+
+    while stack:
+        index, remaining = stack.pop()
+        num = nums[index]
+
+        if index == 0:
+            if remaining == num:
+                return True
+            continue
+
+        if remaining < num:
+            continue
+
+        # Test addition
+        stack.append((index - 1, remaining - num))
 
         # Can we use multiply?
-        (divisor, remainder) = divmod(total, first)
-        if remainder == 0 and inner_test(divisor, rest):
-            # We have a clean division and the rest of the equation works
-            return True
+        if remaining % num == 0:
+            stack.append((index - 1, remaining // num))
 
-        # Test concatenation
+        # Test concatenation: does the total end with this number (and have more digits)?
         if allow_concatenation:
-            total_str = str(total)
-            first_str = str(first)
-            first_str_len = len(first_str)
-            if (
-                total >= 0
-                and len(total_str) > first_str_len
-                and total_str[-first_str_len:] == first_str
-            ):
-                # The total ends with this number
-                remaining_after_concatenation = total_str[:-first_str_len]
-                if inner_test(int(remaining_after_concatenation), rest):
-                    # We have a clean concatenation and the rest of the equation works
-                    return True
+            power = powers[index]
+            if remaining > num and (remaining - num) % power == 0:
+                stack.append((index - 1, (remaining - num) // power))
+
+    return False
 
-        # Test addition
-        remaining_after_addition = total - first
-        return inner_test(remaining_after_addition, rest)
 
-    return inner_test(original_total, list(reversed(all_nums)))
+def next_power_of_ten(num: int) -> int:
+    power = 10
+    while power <= num:
+        power *= 10
+    return power
 
 
-def parse_line(line: str) -> Tuple[int, List[int]]:
+def parse_line(line: str) -> Equation:
     [total_str, rest_str] = line.split(": ")
     return (int(total_str), [int(num) for num in rest_str.split()])
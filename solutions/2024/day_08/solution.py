@@ -1,8 +1,19 @@
 # puzzle prompt: https://adventofcode.com/2024/day/8
 
+# For part 2, every grid position in line with a pair of antennas is an antinode. The
+# positions on that line are a whole number of steps from either antenna, where the step
+# is the difference between them divided by its gcd (so no in-between positions get
+# skipped). Rather than stepping until we fall off the grid, we work out the range of
+# steps that stay on the grid along each axis, and take the overlap.
+#
+# Antinodes are marked in a flat bytearray. Along a line, the flat indices go up by the
+# same amount each step, so the whole line can be marked with one slice assignment.
+
+import sys
 from collections import defaultdict
 from itertools import combinations
-from typing import Dict, List, Set, Tuple
+from math import gcd
+from typing import Dict, List, Tuple
 
 from ...base import StrSplitSolution, answer
 
@@ -10,6 +21,52 @@ type Frequency = str
 type Position = Tuple[int, int]
 
 
+def steps_in_range(start: int, step: int, size: int) -> Tuple[int, int]:
+    """The lowest and highest k for which start + k * step is in [0, size)"""
+    if step == 0:
+        # start is on the grid, so any k will do
+        return (-sys.maxsize, sys.maxsize)
+    if step > 0:
+        return (-(start // step), (size - 1 - start) // step)
+    return (-((size - 1 - start) // -step), start // -step)
+
+
+class Antinodes:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.marks = bytearray(width * height)
+
+    def in_range(self, pos: Position) -> bool:
+        (r, c) = pos
+        return r >= 0 and c >= 0 and r < self.height and c < self.width
+
+    def mark(self, pos: Position):
+        if self.in_range(pos):
+            (r, c) = pos
+            self.marks[r * self.width + c] = 1
+
+    def mark_line(self, pos: Position, step: Position):
+        """Marks every position on the grid that's a whole number of steps from pos"""
+        (r, c) = pos
+        (dr, dc) = step
+        # make sure the flat index goes up with each step, so the slice runs forwards
+        if dr * self.width + dc < 0:
+            dr, dc = -dr, -dc
+
+        (lowest_r, highest_r) = steps_in_range(r, dr, self.height)
+        (lowest_c, highest_c) = steps_in_range(c, dc, self.width)
+        lowest = max(lowest_r, lowest_c)
+        count = min(highest_r, highest_c) - lowest + 1
+
+        first = (r + lowest * dr) * self.width + c + lowest * dc
+        stride = dr * self.width + dc
+        self.marks[first : first + count * stride : stride] = b"\x01" * count
+
+    def count(self) -> int:
+        return self.marks.count(1)
+
+
 class Solution(StrSplitSolution):
     _year = 2024
     _day = 8
@@ -24,49 +81,25 @@ class Solution(StrSplitSolution):
                     d[ch].append(pos)
         return d
 
-    @answer(354)
-    def part_1(self) -> int:
-        return self.compute(1, 1)
-
-    @answer(1263)
-    def part_2(self) -> int:
-        return self.compute(0, 100000)
-
-    def compute(self, min_mult: int, max_mult: int):
+    @answer((354, 1263))
+    def solve(self) -> tuple[int, int]:
         height = len(self.input)
         width = len(self.input[0])
 
-        def in_range(pos: Position) -> bool:
-            (r, c) = pos
-            return r >= 0 and c >= 0 and r < height and c < width
+        antinodes = Antinodes(width, height)
+        resonant_antinodes = Antinodes(width, height)
 
-        antinode_positions: Set[Position] = set()
-
-        frequencies_to_positions = self.parse()
-
-        for positions in frequencies_to_positions.values():
+        for positions in self.parse().values():
             for [pos1, pos2] in combinations(positions, 2):
                 p1r, p1c = pos1
                 p2r, p2c = pos2
                 dr = p2r - p1r
                 dc = p2c - p1c
 
-                mult = min_mult
-                while mult <= max_mult:
-                    antinode1 = (p1r - dr * mult, p1c - dc * mult)
-                    if in_range(antinode1):
-                        antinode_positions.add(antinode1)
-                        mult += 1
-                    else:
-                        break
-
-                mult = min_mult
-                while mult <= max_mult:
-                    antinode2 = (p2r + dr * mult, p2c + dc * mult)
-                    if in_range(antinode2):
-                        antinode_positions.add(antinode2)
-                        mult += 1
-                    else:
-                        break
-
-        return len(antinode_positions)
+                antinodes.mark((p1r - dr, p1c - dc))
+                antinodes.mark((p2r + dr, p2c + dc))
+
+                divisor = gcd(dr, dc)
+                resonant_antinodes.mark_line(pos1, (dr // divisor, dc // divisor))
+
+        return (antinodes.count(), resonant_antinodes.count())
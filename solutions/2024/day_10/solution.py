@@ -3,143 +3,139 @@
 # puzzle prompt: https://adventofcode.com/2024/day/10
 
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+from typing import List, Tuple
 
-from ...base import StrSplitSolution, answer
+import numpy as np
+from numpy.typing import NDArray
+
+from ...base import IntGridSolution, answer, parse_once
+from ...utils.grid import Grid
 
 # We note the positions of each type of value, i.e. all of the 9s, all of the 8s, etc.
 # We start with all the 9s, and add those to the list of achievable 9s to all neighbouring 8s.
 # We pass those on to all neighbouring 7s, and so on.
 # For part 2, it's similar, but we just count the number of paths to 9s
-
-type Position = Tuple[int, int]
-
-
-DIRECTIONS: List[Position] = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-
-
-class TopoMap:
-    def __init__(self, lines: List[str]):
-        self.values = [[int(ch) for ch in line] for line in lines]
-        self.height = len(lines)
-        self.width = len(lines[0])
-
-    def positions(self):
-        return ((row, col) for row in range(self.height) for col in range(self.width))
-
-    def nine_positions(self):
-        return (pos for pos in self.positions() if self.get(pos) == 9)
-
-    def get(self, pos: Position):
-        row, col = pos
-        return self.values[row][col]
-
-    def _all_neighbouring_positions(self, pos: Position):
-        row, col = pos
-        return [(row + dr, col + dc) for (dr, dc) in DIRECTIONS]
-
-    def is_legal_position(self, pos: Position):
-        row, col = pos
-        return row >= 0 and col >= 0 and row < self.height and col < self.width
-
-    def legal_neighbouring_positions(self, pos: Position):
-        return (
-            p
-            for p in self._all_neighbouring_positions(pos)
-            if self.is_legal_position(p)
-        )
-
-    def legal_neighbouring_positions_with_value(self, pos: Position, value: int):
-        return [
-            p for p in self.legal_neighbouring_positions(pos) if self.get(p) == value
-        ]
-
-
-class Solution(StrSplitSolution):
+#
+# Cells are addressed by their flat index, and each 9 gets a number, so the set of 9s
+# reachable from a cell is an int with those bits set: merging sets is a single `|`.
+# A trail is 9 steps long, so any two 9s reachable from the same cell are less than
+# WINDOW rows (and cols) apart. Numbering them by their row and col _modulo_ WINDOW
+# therefore never gives two of them the same number, and keeps every bitmask small,
+# however big the map is.
+# Once a level has passed its 9s down to the next, it's no longer needed, so we only
+# ever hold two levels' worth of sets.
+# Part 2's path counts are a flat numpy array, so each level is added in one go.
+
+HEIGHTS = 10
+WINDOW = 2 * (HEIGHTS - 1) + 1
+
+
+class TopoMap(Grid[int]):
+    def __init__(self, heights: NDArray[np.int64]):
+        super().__init__(heights.tolist())
+        self.heights = heights.ravel()
+
+    def indices_by_height(self) -> List[NDArray[np.int64]]:
+        """The flat indices of every cell, grouped by the cell's height"""
+        order = np.argsort(self.heights, kind="stable")
+        bounds = np.cumsum(np.bincount(self.heights, minlength=HEIGHTS))
+        return np.split(order, bounds[:-1])
+
+    def downhill_steps(
+        self, indices: NDArray[np.int64], height: int
+    ) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """
+        Every step from one of the cells (all at `height`) to a neighbour one lower, as
+        parallel arrays of the indices of the cells it goes from and to
+        """
+        neighbours = self.neighbour_table()[indices]
+        steps = (neighbours >= 0) & (self.heights[neighbours] == height - 1)
+        srcs = np.broadcast_to(indices[:, np.newaxis], neighbours.shape)
+        return srcs[steps], neighbours[steps]
+
+
+class Solution(IntGridSolution):
     _year = 2024
     _day = 10
 
+    @parse_once
+    def parse(self) -> TopoMap:
+        return TopoMap(self.input)
+
     @answer(617)
     def part_1(self) -> int:
-        m = TopoMap(self.input)
-        store = Store1()
-        traverse(m, store)
-
-        return sum(
-            len(store.get_nines_available_from(pos))
-            for pos in m.positions()
-            if m.get(pos) == 0
-        )
+        m = self.parse()
+        return traverse(m, Store1(m.size))
 
     @answer(1477)
     def part_2(self) -> int:
-        m = TopoMap(self.input)
-        store = Store2()
-        traverse(m, store)
-
-        return sum(
-            store.get_nines_available_from(pos)
-            for pos in m.positions()
-            if m.get(pos) == 0
-        )
+        m = self.parse()
+        return traverse(m, Store2(m.size))
 
 
 class Store(ABC):
     @abstractmethod
-    def add_nine(self, pos: Position):
+    def add_nines(self, indices: NDArray[np.int64], nine_ids: NDArray[np.int64]):
         pass
 
     @abstractmethod
-    def merge_nines(self, src: Position, dest: Position):
-        pass
+    def merge_nines(self, srcs: NDArray[np.int64], dests: NDArray[np.int64]):
+        """Passes on the 9s available from each src to the matching dest"""
+
+    @abstractmethod
+    def score(self, indices: NDArray[np.int64]) -> int:
+        """The total score of the cells"""
 
 
 class Store1(Store):
-    def __init__(self):
-        self.nines_available_from: Dict[Position, Set[Position]] = defaultdict(set)
+    """Tracks which 9s are reachable from each cell, as a bitmask of their ids"""
 
-    def add_nine(self, pos: Position):
-        self.nines_available_from[pos].add(pos)
+    def __init__(self, size: int):
+        self.nines_available_from: List[int] = [0] * size
 
-    def merge_nines(self, src: Position, dest: Position):
-        for nine_from_pos in self.nines_available_from[src]:
-            self.nines_available_from[dest].add(nine_from_pos)
+    def add_nines(self, indices: NDArray[np.int64], nine_ids: NDArray[np.int64]):
+        for index, nine_id in zip(indices.tolist(), nine_ids.tolist()):
+            self.nines_available_from[index] = 1 << nine_id
 
-    def get_nines_available_from(self, pos: Position):
-        return self.nines_available_from[pos]
+    def merge_nines(self, srcs: NDArray[np.int64], dests: NDArray[np.int64]):
+        available = self.nines_available_from
+        for src, dest in zip(srcs.tolist(), dests.tolist()):
+            available[dest] |= available[src]
+        # the srcs have passed on everything they know, so they can be forgotten
+        for src in srcs.tolist():
+            available[src] = 0
+
+    def score(self, indices: NDArray[np.int64]) -> int:
+        available = self.nines_available_from
+        return sum(available[index].bit_count() for index in indices.tolist())
 
 
 class Store2(Store):
-    def __init__(self):
-        self.nines_available_from: Dict[Position, int] = defaultdict(lambda: 0)
+    """Counts the paths from each cell to 9s"""
+
+    def __init__(self, size: int):
+        self.nines_available_from = np.zeros(size, dtype=np.int64)
 
-    def add_nine(self, pos: Position):
-        self.nines_available_from[pos] = 1
+    def add_nines(self, indices: NDArray[np.int64], _nine_ids: NDArray[np.int64]):
+        self.nines_available_from[indices] = 1
 
-    def merge_nines(self, src: Position, dest: Position):
-        self.nines_available_from[dest] += self.nines_available_from[src]
+    def merge_nines(self, srcs: NDArray[np.int64], dests: NDArray[np.int64]):
+        available = self.nines_available_from
+        np.add.at(available, dests, available[srcs])
 
-    def get_nines_available_from(self, pos: Position):
-        return self.nines_available_from[pos]
+    def score(self, indices: NDArray[np.int64]) -> int:
+        return int(self.nines_available_from[indices].sum())
 
 
-def traverse(m: TopoMap, store: Store):
-    all_nine_positions = list(m.nine_positions())
+def traverse(m: TopoMap, store: Store) -> int:
+    """Works out what's reachable from every cell, and returns the total trailhead score"""
+    by_height = m.indices_by_height()
 
-    for pos in all_nine_positions:
-        store.add_nine(pos)
+    nines = by_height[HEIGHTS - 1]
+    rows, cols = np.divmod(nines, m.width)
+    store.add_nines(nines, (rows % WINDOW) * WINDOW + cols % WINDOW)
 
-    previous_level_positions = all_nine_positions
-    next_level_positions: Set[Position] = set()
-    level = 9
+    for height in range(HEIGHTS - 1, 0, -1):
+        store.merge_nines(*m.downhill_steps(by_height[height], height))
 
-    while level > 0:
-        for pos in previous_level_positions:
-            next_level = level - 1
-            for p2 in m.legal_neighbouring_positions_with_value(pos, next_level):
-                next_level_positions.add(p2)
-                store.merge_nines(pos, p2)
-        previous_level_positions = next_level_positions
-        level = next_level
-        next_level_positions = set()
+    return store.score(by_height[0])
@@ -1,39 +1,44 @@
 # puzzle prompt: https://adventofcode.com/2024/day/11
 
-# The trick for this day is not to try to keep hold of the list of stones, but just to compute the
-# number of stones each stone morphs into, and to apply memoization. The cache ends up with 116314 entries in it.
+# The trick for this day is not to try to keep hold of the list of stones: stones with the
+# same number always turn into the same stones, and their order never matters. So we keep
+# a count of how many stones there are of each number, and blink the whole generation at
+# once. Only a few thousand distinct numbers ever turn up, so memory stays bounded no
+# matter how many times we blink, and there's no recursion to run out of.
 
-from typing import Dict, Tuple
+from collections import Counter
+from functools import cache
+from typing import Iterable, Tuple
 
 from ...base import IntSplitSolution, answer
 
-cache: Dict[Tuple[int, int], int] = {}
 
+@cache
+def transition(stone: int) -> Tuple[int, ...]:
+    """The stones that a single stone turns into after one blink"""
+    if stone == 0:
+        return (1,)
 
-def blink(stone: int, levels: int) -> int:
-    if levels == 0:
-        return 1
+    stone_str = str(stone)
+    if len(stone_str) % 2 == 0:
+        midpoint = len(stone_str) // 2
+        return (int(stone_str[:midpoint]), int(stone_str[midpoint:]))
 
-    cache_key = (stone, levels)
-    result = cache.get(cache_key)
-    if result is not None:
-        return result
+    return (stone * 2024,)
 
-    if stone == 0:
-        result = blink(1, levels - 1)
-    else:
-        stone_str = str(stone)
-        if len(stone_str) % 2 == 0:
-            midpoint = len(stone_str) // 2
-            new_stone_1 = int(stone_str[:midpoint])
-            new_stone_2 = int(stone_str[midpoint:])
 
-            result = blink(new_stone_1, levels - 1) + blink(new_stone_2, levels - 1)
-        else:
-            result = blink(stone * 2024, levels - 1)
+def count_stones(stones: Iterable[int], levels: int) -> int:
+    """How many stones there are after blinking `levels` times"""
+    counts = Counter(stones)
+
+    for _ in range(levels):
+        next_counts: Counter[int] = Counter()
+        for stone, count in counts.items():
+            for new_stone in transition(stone):
+                next_counts[new_stone] += count
+        counts = next_counts
 
-    cache[cache_key] = result
-    return result
+    return counts.total()
 
 
 class Solution(IntSplitSolution):
@@ -43,8 +48,8 @@ class Solution(IntSplitSolution):
 
     @answer(222461)
     def part_1(self) -> int:
-        return sum(blink(stone, 25) for stone in self.input)
+        return count_stones(self.input, 25)
 
     @answer(264350935776416)
     def part_2(self) -> int:
-        return sum(blink(stone, 75) for stone in self.input)
+        return count_stones(self.input, 75)
@@ -1,121 +1,154 @@
 # puzzle prompt: https://adventofcode.com/2024/day/13
-import math
 import re
-from typing import List
-
-from ...base import StrSplitSolution, answer
-
-
-class XY:
-    def __init__(self, x: int, y: int):
-        self.x = x
-        self.y = y
-
-
-class ClawMachine:
-    def __init__(self, info_a: XY, info_b: XY, prize: XY):
-        self.info_a = info_a
-        self.info_b = info_b
-        self.prize = prize
-
-
-button_pattern = re.compile("Button [AB]: X([-+\\d]+), Y([-+\\d]+)")
-prize_pattern = re.compile("Prize: X=(\\d+), Y=(\\d+)")
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ...base import AoCException, TextSolution, answer, parse_once
+
+# Each machine gives us two equations in two unknowns:
+#   prize_x = a_presses * a_x + b_presses * b_x
+#   prize_y = a_presses * a_y + b_presses * b_y
+# which have a single solution (Cramer's rule), as long as the buttons aren't parallel:
+#   a_presses = (prize_x * b_y - prize_y * b_x) / (a_x * b_y - a_y * b_x)
+#   b_presses = (a_x * prize_y - a_y * prize_x) / (a_x * b_y - a_y * b_x)
+# The machine can only be won if both divisions are exact and the results aren't negative.
+
+# We can't use numpy to solve it via linalg.solve because it doesn't provide enough
+# accuracy because of its use of floating point arithmetic. But every step above is
+# integer arithmetic, and even with part 2's offset the products stay around 10**15,
+# well inside int64, so we can solve every machine at once, exactly.
+#
+# If the buttons _are_ parallel, every press moves the claw along the same line, so the
+# machine is really one equation, along whichever axis the buttons move in. That has
+# either no solutions or lots of them, so we look for the cheapest one separately.
+
+# the columns of the parsed machines array
+A_X, A_Y, B_X, B_Y, PRIZE_X, PRIZE_Y = range(6)
+
+A_COST = 3
+B_COST = 1
+
+
+def parse_machines(text: str) -> NDArray[np.int64]:
+    """
+    Reads every machine into an (n, 6) array, in a single pass. Each machine is exactly
+    six numbers, in the order of the column constants above
+    """
+    numbers = [int(n) for n in re.findall("-?\\d+", text)]
+    return np.array(numbers, dtype=np.int64).reshape(-1, 6)
+
+
+def cheapest_presses(a_step: int, b_step: int, target: int) -> Tuple[int, int] | None:
+    """
+    The (a_presses, b_presses) with a_presses * a_step + b_presses * b_step == target
+    that cost the fewest tokens, with neither negative, or None if there aren't any
+    """
+    if a_step < 0 or b_step < 0:
+        raise AoCException("Parallel buttons are only handled when they move forwards")
+
+    if a_step == 0 or b_step == 0:
+        if a_step == b_step:
+            return (0, 0) if target == 0 else None
+        # only one button does anything, so pressing the other is a waste
+        step = a_step or b_step
+        presses, remainder = divmod(target, step)
+        if remainder != 0 or presses < 0:
+            return None
+        return (presses, 0) if a_step else (0, presses)
+
+    divisor = gcd(a_step, b_step)
+    if target % divisor != 0:
+        return None
+    a_step, b_step, target = a_step // divisor, b_step // divisor, target // divisor
+
+    # The fewest A presses that leave a multiple of b_step for B to make up. Every other
+    # solution swaps b_step presses of A for a_step presses of B (or back)
+    a_presses = target * pow(a_step, -1, b_step) % b_step
+    b_presses, remainder = divmod(target - a_presses * a_step, b_step)
+    assert remainder == 0
+    if b_presses < 0:
+        return None
+
+    if b_step * A_COST < a_step * B_COST:
+        # A is the better deal, so press it as much as possible
+        swaps = b_presses // a_step
+        return (a_presses + swaps * b_step, b_presses - swaps * a_step)
+    return (a_presses, b_presses)
+
+
+def total_tokens(machines: NDArray[np.int64], prize_offset: int) -> int:
+    """The fewest tokens needed to win every winnable machine"""
+    a_x, a_y, b_x, b_y = (machines[:, col] for col in (A_X, A_Y, B_X, B_Y))
+    prize_x = machines[:, PRIZE_X] + prize_offset
+    prize_y = machines[:, PRIZE_Y] + prize_offset
+
+    determinant = a_x * b_y - a_y * b_x
+    a_numerator = prize_x * b_y - prize_y * b_x
+    b_numerator = a_x * prize_y - a_y * prize_x
+
+    solvable = determinant != 0
+    safe_determinant = np.where(solvable, determinant, 1)
+    a_presses, a_remainder = np.divmod(a_numerator, safe_determinant)
+    b_presses, b_remainder = np.divmod(b_numerator, safe_determinant)
+
+    winnable = (
+        solvable
+        & (a_remainder == 0)
+        & (b_remainder == 0)
+        & (a_presses >= 0)
+        & (b_presses >= 0)
+    )
+    costs = a_presses * A_COST + b_presses * B_COST
+    total = int(costs[winnable].sum())
+
+    # Parallel buttons (determinant 0) don't turn up in real inputs, but if they do
+    for index in np.flatnonzero(~solvable).tolist():
+        total += parallel_tokens(
+            *(int(machines[index, col]) for col in (A_X, A_Y, B_X, B_Y)),
+            int(prize_x[index]),
+            int(prize_y[index]),
+        )
 
+    return total
 
-def read_button_info(line: str):
-    m = button_pattern.match(line)
-    return XY(int(m.groups()[0]), int(m.groups()[1]))
 
+def parallel_tokens(
+    a_x: int, a_y: int, b_x: int, b_y: int, prize_x: int, prize_y: int
+) -> int:
+    """The fewest tokens to win a machine whose buttons are parallel, or 0 if it can't be"""
+    # solve along x, unless neither button moves that way
+    if a_x or b_x:
+        presses = cheapest_presses(a_x, b_x, prize_x)
+    else:
+        presses = cheapest_presses(a_y, b_y, prize_y)
 
-def read_prize_info(line: str):
-    m = prize_pattern.match(line)
-    return XY(int(m.groups()[0]), int(m.groups()[1]))
+    if presses is None:
+        return 0
+    (a_presses, b_presses) = presses
+    # the prize might not be on the buttons' line at all
+    if (
+        a_presses * a_x + b_presses * b_x != prize_x
+        or a_presses * a_y + b_presses * b_y != prize_y
+    ):
+        return 0
+    return a_presses * A_COST + b_presses * B_COST
 
 
-class Solution(StrSplitSolution):
+class Solution(TextSolution):
     _year = 2024
     _day = 13
 
-    def _parse(self) -> List[ClawMachine]:
-        line_iterator = iter(self.input)
-        claw_machines: List[ClawMachine] = []
-
-        try:
-            while True:
-                info_a = read_button_info(next(line_iterator))
-                info_b = read_button_info(next(line_iterator))
-                prize = read_prize_info(next(line_iterator))
-                claw = ClawMachine(info_a, info_b, prize)
-                claw_machines.append(claw)
-                next(line_iterator)
-        except StopIteration:
-            pass
-
-        return claw_machines
+    @parse_once
+    def _parse(self) -> NDArray[np.int64]:
+        return parse_machines(self.input)
 
     @answer(32026)
     def part_1(self) -> int:
-        claw_machines = self._parse()
-        return sum(
-            tokens_for_cheapest_option(claw_machine) for claw_machine in claw_machines
-        )
+        return total_tokens(self._parse(), 0)
 
     @answer(89013607072065)
     def part_2(self) -> int:
-        claw_machines = self._parse()
-        for claw_machine in claw_machines:
-            claw_machine.prize.x += 10000000000000
-            claw_machine.prize.y += 10000000000000
-        return sum(
-            tokens_for_cheapest_option(claw_machine) for claw_machine in claw_machines
-        )
-
-
-def tokens_for_cheapest_option(claw_machine: ClawMachine):
-    press_options2 = list(get_presses(claw_machine))
-
-    if len(press_options2) > 0:
-        return min(
-            a_presses * 3 + b_presses for (a_presses, b_presses) in press_options2
-        )
-    return 0
-
-
-def get_presses(claw_machine: ClawMachine):
-    info_a = claw_machine.info_a
-    info_b = claw_machine.info_b
-    prize = claw_machine.prize
-
-    # We have two equations
-    # prize.x = a_presses * info_a.x + b_presses * info_b.x
-    # prize.y = a_presses * info_a.y + b_presses * info_b.y
-
-    # We can't use numpy to solve it via linalg.solve because it doesn't provide enough accuracy because
-    # of its use of floating point arithmetic. So we have to solve manually.
-    # We don't want to do any non-integer division, so we multiply both
-    # equations to produce a_presses * lcm(info_a.x and info_a.y) in both equations
-    a_lcm = math.lcm(info_a.x, info_a.y)
-    factor1 = a_lcm // info_a.x
-    factor2 = a_lcm // info_a.y
-    # prize.x * factor1 = a_presses * a_lcm + b_presses * info_b.x * factor1
-    # prize.y * factor2 = a_presses * a_lcm + b_presses * info_b.y * factor2
-    # Rearranging and subtracting `a_presses * a_lcm``, we get
-    # prize.x * factor1 - b_presses * info_b.x * factor1 = prize.y * factor2 - b_presses * info_b.y * factor2
-    # =>
-    # prize.x * factor1 - prize.y * factor2 = b_presses * info_b.x * factor1 - b_presses * info_b.y * factor2
-    # =>
-    # prize.x * factor1 - prize.y * factor2 = b_presses * (info_b.x * factor1 - info_b.y * factor2)
-    # =>
-    # (prize.x * factor1 - prize.y * factor2) / (info_b.x * factor1 - info_b.y * factor2) = b_presses
-    b_presses = (prize.x * factor1 - prize.y * factor2) // (
-        info_b.x * factor1 - info_b.y * factor2
-    )
-    a_presses = (prize.x - b_presses * info_b.x) // info_a.x
-
-    # We've forced both to use integer arithmetic, to preserve accuracy, so the answers may be wrong. Test.
-    if (
-        a_presses * info_a.x + b_presses * info_b.x == prize.x
-        and a_presses * info_a.y + b_presses * info_b.y == prize.y
-    ):
-        yield (a_presses, b_presses)
+        return total_tokens(self._parse(), 10000000000000)
@@ -1,10 +1,20 @@
 # puzzle prompt: https://adventofcode.com/2024/day/14
 
+# Each robot's x position repeats every `width` seconds, and its y position every
+# `height` seconds, independently of each other. When the robots draw the tree, they're
+# bunched together, so the spread (variance) of their x positions is at its lowest, and
+# likewise for y. So we find the x-offset in [0, width) with the lowest x variance and
+# the y-offset in [0, height) with the lowest y variance, trying every offset for every
+# robot at once. The width and height are coprime, so the Chinese remainder theorem
+# gives the one time in [0, width * height) that has both offsets.
+
 import re
-from collections import Counter
 from typing import Iterable, Tuple
 
-from ...base import StrSplitSolution, answer, slow
+import numpy as np
+from numpy.typing import NDArray
+
+from ...base import StrSplitSolution, answer, parse_once
 
 type Vector = Tuple[int, int]
 type Position = Vector
@@ -14,12 +24,30 @@ type Velocity = Vector
 pattern = re.compile("p=(-?\\d+),(-?\\d+) v=(-?\\d+),(-?\\d+)")
 
 
-def parse_line(line: str) -> Tuple[Vector, Vector]:
-    match = pattern.match(line)
-    return [
-        [int(match.group(1)), int(match.group(2))],
-        [int(match.group(3)), int(match.group(4))],
-    ]
+class Robots:
+    def __init__(self, lines: Iterable[str]):
+        values = np.array(
+            [[int(n) for n in pattern.match(line).groups()] for line in lines],
+            dtype=np.int64,
+        )
+        self.x, self.y, self.dx, self.dy = values.T
+
+    def positions_after(
+        self, steps: int, width: int, height: int
+    ) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        return (self.x + steps * self.dx) % width, (self.y + steps * self.dy) % height
+
+
+def most_clustered_offset(
+    start: NDArray[np.int64], velocity: NDArray[np.int64], period: int
+) -> int:
+    """
+    The number of steps in [0, period) at which the positions along one axis have the
+    lowest variance
+    """
+    steps = np.arange(period)[:, np.newaxis]
+    positions = (start + steps * velocity) % period
+    return int(positions.var(axis=1).argmin())
 
 
 class Solution(StrSplitSolution):
@@ -31,6 +59,10 @@ class Solution(StrSplitSolution):
             return (101, 103)
         return (11, 7)
 
+    @parse_once
+    def parse(self) -> Robots:
+        return Robots(self.input)
+
     @answer(231221760)
     def part_1(self) -> int:
         width, height = self.get_width_height()
@@ -38,49 +70,33 @@ class Solution(StrSplitSolution):
         mid_row = (height - 1) // 2
         mid_col = (width - 1) // 2
 
-        robots = [parse_line(line) for line in self.input]
-        final_positions = [advance(robot, 100, width, height) for robot in robots]
-        final_quadrants = [
-            determine_quadrant(final_position, mid_row, mid_col)
-            for final_position in final_positions
+        x, y = self.parse().positions_after(100, width, height)
+        quadrant_counts = [
+            int(np.count_nonzero(in_cols & in_rows))
+            for in_rows in (y < mid_row, y > mid_row)
+            for in_cols in (x < mid_col, x > mid_col)
         ]
-        counts = Counter(final_quadrants)
-        return counts[0] * counts[1] * counts[2] * counts[3]
+        return int(np.prod(quadrant_counts))
 
     @answer(6771)
-    @slow
     def part_2(self) -> int:
-        robots = [parse_line(line) for line in self.input]
+        robots = self.parse()
         width, height = self.get_width_height()
 
-        steps = 0
-
-        positions = [pos for (pos, _) in robots]
-
-        def calc_pos(latest_pos: Position, velocity: Velocity) -> Position:
-            (x, y) = latest_pos
-            (dx, dy) = velocity
-            return ((x + dx) % width, (y + dy) % height)
-
-        while True:
-            x_count = Counter(x for (x, y) in positions)
-            max_x_count = max(count for count in x_count.values())
-            y_count = Counter(y for (x, y) in positions)
-            max_y_count = max(count for count in y_count.values())
+        x_offset = most_clustered_offset(robots.x, robots.dx, width)
+        y_offset = most_clustered_offset(robots.y, robots.dy, height)
 
-            # How do we detect a 'tree'? We look for any layout that has
-            # at least 32 in one row and column
-            if max_x_count >= 32 and max_y_count >= 32:
-                # print_positions(positions, width, height)
-                return steps
+        # We want steps = x_offset (mod width) and steps = y_offset (mod height)
+        # steps = x_offset + width * k, so width * k = y_offset - x_offset (mod height)
+        k = (y_offset - x_offset) * pow(width, -1, height) % height
+        steps = x_offset + width * k
 
-            steps += 1
-            new_positions = [
-                calc_pos(latest_pos, robots[i][1])
-                for (i, latest_pos) in enumerate(positions)
-            ]
+        if self.is_debugging:
+            print_positions(
+                zip(*robots.positions_after(steps, width, height)), width, height
+            )
 
-            positions = new_positions
+        return steps
 
 
 def print_positions(positions: Iterable[Position], width: int, height: int):
@@ -93,33 +109,3 @@ def print_positions(positions: Iterable[Position], width: int, height: int):
             print(pic.get((x, y), "."), end="")
         print()
     print()
-
-
-def advance(
-    start: Tuple[Position, Velocity], steps: int, width: int, height: int
-) -> Position:
-    (start_pos, vel) = start
-    (start_x, start_y) = start_pos
-    (dx, dy) = vel
-
-    final_x = (start_x + steps * dx) % width
-    final_y = (start_y + steps * dy) % height
-
-    return (final_x, final_y)
-
-
-def determine_quadrant(pos: Position, mid_row: int, mid_col: int) -> int:
-    (x, y) = pos
-
-    if y < mid_row:
-        if x < mid_col:
-            return 0
-        if x > mid_col:
-            return 1
-    elif y > mid_row:
-        if x < mid_col:
-            return 2
-        if x > mid_col:
-            return 3
-
-    return None
@@ -1,10 +1,24 @@
 # puzzle prompt: https://adventofcode.com/2024/day/22
 
-from itertools import islice, pairwise
-from typing import Dict, List, Set, Tuple
+# Every buyer's secret evolves the same way, so we evolve all of them at once as a numpy
+# array. (`evolve` only uses operators that work the same on ints and arrays.)
+#
+# For part 2, each run of 4 price changes is encoded as one int in [0, 19**4): each
+# change is in [-9, 9], so shifting it by 9 gives a base-19 digit. A buyer only sells at
+# the first time a sequence appears, so we find each (buyer, sequence)'s first
+# occurrence with `np.unique` and add those prices into one flat array of totals per
+# sequence. The best total is then just its max.
+
+import numpy as np
+from numpy.typing import NDArray
 
 from ...base import StrSplitSolution, answer
 
+STEPS = 2000
+SEQUENCES = 19**4
+# buyers are handled in blocks, so memory stays flat however many there are
+BUYERS_PER_CHUNK = 4096
+
 
 class Solution(StrSplitSolution):
     _year = 2024
@@ -12,53 +26,63 @@ class Solution(StrSplitSolution):
 
     @answer((13584398738, 1612))
     def solve(self) -> tuple[int, int]:
-        # Compute the lists of secrets once for both parts
-        secret_lists = [
-            list(islice(run_evolve(int(line)), 0, 2001)) for line in self.input
-        ]
-
-        part1 = sum(secret_list[2000] for secret_list in secret_lists)
-
-        unique_keys: Set[int] = set()
-        dicts = [
-            collect_diffs(secret_list, unique_keys) for secret_list in secret_lists
-        ]
-
-        def total(key: Tuple[int, int, int, int]) -> int:
-            best_prices = [d.get(key, 0) for d in dicts]
-            return sum(best_prices)
-
-        best_prices = (total(key) for key in unique_keys)
-        part2 = max(best_prices)
-
-        return (part1, part2)
-
-
-def collect_diffs(secret_list: List[int], unique_keys: Set[int]) -> Dict[int, int]:
-    values = [value % 10 for value in secret_list]
-    diffs = [y - x for (x, y) in pairwise(values)]
-
-    first_values: Dict[int, int] = {}
-
-    for i in range(len(diffs) - 3):
-        key = 0
-        key = tuple(diffs[i : i + 4])
-
-        if key not in first_values:
-            # First time we've seen this sequence of diffs for this list
-            first_values[key] = values[i + 4]
-            unique_keys.add(key)
-
-    return first_values
-
-
-def run_evolve(num: int):
-    while True:
-        yield num
-        num = evolve(num)
-
-
-def evolve(secret: int) -> int:
+        initial_secrets = np.array([int(line) for line in self.input], dtype=np.int64)
+
+        part1 = 0
+        totals = np.zeros(SEQUENCES, dtype=np.int64)
+
+        for chunk_start in range(0, len(initial_secrets), BUYERS_PER_CHUNK):
+            chunk = initial_secrets[chunk_start : chunk_start + BUYERS_PER_CHUNK]
+            final_secrets, prices = evolve_all(chunk)
+            part1 += int(final_secrets.sum())
+            totals += sequence_totals(prices)
+
+        return (part1, int(totals.max()))
+
+
+def evolve_all(
+    secrets: NDArray[np.int64],
+) -> tuple[NDArray[np.int64], NDArray[np.int8]]:
+    """
+    Evolves every secret STEPS times. Returns the final secrets, and a (buyers, STEPS + 1)
+    array of every price each buyer offers, including the initial one
+    """
+    prices = np.empty((len(secrets), STEPS + 1), dtype=np.int8)
+    prices[:, 0] = secrets % 10
+    for step in range(1, STEPS + 1):
+        secrets = evolve(secrets)
+        prices[:, step] = secrets % 10
+    return secrets, prices
+
+
+def sequence_totals(prices: NDArray[np.int8]) -> NDArray[np.int64]:
+    """
+    For every sequence of 4 price changes, the total price we'd get across all buyers
+    """
+    buyers = len(prices)
+    digits = np.diff(prices.astype(np.int64), axis=1) + 9
+    sequences = (
+        digits[:, :-3] * 19**3
+        + digits[:, 1:-2] * 19**2
+        + digits[:, 2:-1] * 19
+        + digits[:, 3:]
+    )
+    # the price is taken as the 4th change of the sequence happens
+    sale_prices = prices[:, 4:]
+
+    # Label each sequence with its buyer too, so each (buyer, sequence) is unique.
+    # Rows are in time order, so `return_index` finds each one's first occurrence
+    per_buyer = sequences + np.arange(buyers)[:, np.newaxis] * SEQUENCES
+    _, first_indexes = np.unique(per_buyer.ravel(), return_index=True)
+
+    return np.bincount(
+        sequences.ravel()[first_indexes],
+        weights=sale_prices.ravel()[first_indexes],
+        minlength=SEQUENCES,
+    ).astype(np.int64)
+
+
+def evolve[T: (int, NDArray[np.int64])](secret: T) -> T:
     res = secret * 64
     res = mix(res, secret)
     res = prune(res)
@@ -70,9 +94,9 @@ def evolve(secret: int) -> int:
     return prune(res)
 
 
-def mix(val1: int, val2: int) -> int:
+def mix[T: (int, NDArray[np.int64])](val1: T, val2: T) -> T:
     return val1 ^ val2
 
 
-def prune(val: int) -> int:
+def prune[T: (int, NDArray[np.int64])](val: T) -> T:
     return val % 16777216
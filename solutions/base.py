@@ -8,13 +8,21 @@ If something in here is giving you trouble, please file an issue:
 https://github.com/xavdid/advent-of-code-python-template/issues
 """
 
+import hashlib
+import inspect
+import mmap
+import pickle
+import tempfile
 from enum import Enum, auto
 from functools import wraps
 from pathlib import Path
 from pprint import pprint
 from typing import (
+    TYPE_CHECKING,
+    Any,
     Callable,
     Generic,
+    Iterator,
     TypeVar,
     TypeVarTuple,
     Union,
@@ -24,6 +32,11 @@ from typing import (
     overload,
 )
 
+if TYPE_CHECKING:
+    # numpy is only needed by the grid input types, so it's imported lazily
+    import numpy as np
+    from numpy.typing import NDArray
+
 
 class AoCException(Exception):
     """
@@ -40,6 +53,14 @@ class InputTypes(Enum):
     STRSPLIT = auto()
     # int[], split by a split by a specified separator (default newline)
     INTSPLIT = auto()
+    # str[], but read lazily, one line at a time; for inputs too big to hold in memory
+    LINES_STREAM = auto()
+    # the raw bytes of the file, memory-mapped read-only
+    BYTES_MMAP = auto()
+    # a rectangular block of characters, as a 2-D numpy array of their (uint8) byte values
+    CHARGRID = auto()
+    # a rectangular block of digits, as a 2-D numpy array of int64
+    INTGRID = auto()
 
 
 # almost always int, but occasionally str; None is fine to disable a part
@@ -52,9 +73,76 @@ def print_answer(i: int, ans: ResultType):
         print(f"=== {ans}")
 
 
-InputType = Union[str, int, list[int], list[str], list[list[int]]]
+class LineStream:
+    """
+    The lines of a file (without their newlines), read lazily. Each loop over it re-reads
+    the file, so both parts can iterate it. Like STRSPLIT, leading and trailing blank
+    lines are skipped.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __iter__(self) -> Iterator[str]:
+        with self.path.open() as f:
+            started = False
+            # blank lines are held back until we know they're not trailing ones
+            blank_lines = 0
+            for raw_line in f:
+                line = raw_line.rstrip("\n")
+                if not line:
+                    if started:
+                        blank_lines += 1
+                    continue
+
+                started = True
+                for _ in range(blank_lines):
+                    yield ""
+                blank_lines = 0
+                yield line
+
+
+def parse_char_grid(data: str) -> "NDArray[np.uint8]":
+    """
+    Turns newline-separated rows of ASCII text into a 2-D array of bytes, in one pass
+    """
+    import numpy as np
+
+    width = data.find("\n")
+    if width == -1:
+        width = len(data)
+
+    # with a newline on the end, every row (plus its newline) is the same size...
+    raw = np.frombuffer(f"{data}\n".encode("ascii"), dtype=np.uint8)
+    if raw.size % (width + 1):
+        raise AoCException(
+            "Grid input must be rectangular, but its rows differ in length"
+        )
+    rows = raw.reshape(-1, width + 1)
+    # ... as long as the newlines all line up
+    if not (rows[:, width] == ord("\n")).all():
+        raise AoCException(
+            "Grid input must be rectangular, but its rows differ in length"
+        )
+
+    return np.ascontiguousarray(rows[:, :width])
+
+
+InputType = Union[
+    str,
+    int,
+    list[int],
+    list[str],
+    list[list[int]],
+    LineStream,
+    mmap.mmap,
+    "NDArray[Any]",
+]
 I = TypeVar("I", bound=InputType)
 
+# where `@parse_once` methods store their results when `persist_parsed_input` is set
+PARSE_CACHE_DIR = Path(__file__).parent.parent / ".parse_cache"
+
 
 class BaseSolution(Generic[I]):
     separator = "\n"
@@ -63,11 +151,14 @@ class BaseSolution(Generic[I]):
     input_type: InputTypes = InputTypes.TEXT
     _year: int
     _day: int
+    # store the results of `@parse_once` methods on disk, so later runs can skip parsing
+    persist_parsed_input = False
 
     def __init__(self, run_slow=False, is_debugging=False, use_test_data=False):
         self.slow = run_slow  # should run slow functions?
         self.is_debugging = is_debugging
         self.use_test_data = use_test_data
+        self._parsed: dict[str, Any] = {}
 
         self.input = cast(I, self.read_input())
 
@@ -106,12 +197,9 @@ class BaseSolution(Generic[I]):
         else:
             raise NotImplementedError
 
-    @final
-    def read_input(self) -> InputType:
-        """
-        handles locating, reading, and parsing input files
-        """
-        input_file = Path(
+    @property
+    def input_file(self) -> Path:
+        return Path(
             # __file__ is the solution base
             Path(__file__).parent,
             # the 4-digit year
@@ -121,17 +209,40 @@ class BaseSolution(Generic[I]):
             # either the real input or the test input
             f"input{'.test' if self.use_test_data else ''}.txt",
         )
+
+    @final
+    def read_input(self) -> InputType:
+        """
+        handles locating, reading, and parsing input files
+        """
+        input_file = self.input_file
         if not input_file.exists():
             raise AoCException(
                 f'Failed to find an input file at path "./{input_file.relative_to(Path.cwd())}". You can run `./start --year {self.year} {self.day}` to create it.'
             )
 
+        empty_file_error = AoCException(
+            f'Found a file at path "./{input_file.relative_to(Path.cwd())}", but it was empty. Make sure to paste some input!'
+        )
+
+        # the lazy types don't read the whole file up front
+        if self.input_type is InputTypes.LINES_STREAM:
+            lines = LineStream(input_file)
+            if next(iter(lines), None) is None:
+                raise empty_file_error
+            return lines
+
+        if self.input_type is InputTypes.BYTES_MMAP:
+            if input_file.stat().st_size == 0:
+                raise empty_file_error
+            with input_file.open("rb") as f:
+                # the mapping stays valid after the file is closed
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
         data = input_file.read_text().strip("\n")
 
         if not data:
-            raise AoCException(
-                f'Found a file at path "./{input_file.relative_to(Path.cwd())}", but it was empty. Make sure to paste some input!'
-            )
+            raise empty_file_error
 
         if self.input_type is InputTypes.TEXT:
             return data
@@ -139,6 +250,15 @@ class BaseSolution(Generic[I]):
         if self.input_type is InputTypes.INTEGER:
             return int(data)
 
+        if self.input_type is InputTypes.CHARGRID:
+            return parse_char_grid(data)
+
+        if self.input_type is InputTypes.INTGRID:
+            digits = parse_char_grid(data).astype("int64") - ord("0")
+            if ((digits < 0) | (digits > 9)).any():
+                raise AoCException("INTGRID input must only contain the digits 0-9")
+            return digits
+
         if (
             self.input_type is InputTypes.STRSPLIT
             or self.input_type is InputTypes.INTSPLIT
@@ -153,6 +273,69 @@ class BaseSolution(Generic[I]):
 
         raise ValueError(f"Unrecognized input_type: {self.input_type}")
 
+    @final
+    def _parse_cache_prefix(self, name: str) -> str:
+        return f"{self.year}_day_{self.day:02}_{name}_"
+
+    @final
+    def _parse_cache_path(self, name: str) -> Path:
+        """
+        Where the result of the `name` parse method is persisted. The key covers the input,
+        the solution's source and the shared code it's built from (this file and `utils/`),
+        so editing any of them invalidates the cache.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.input_file.read_bytes())
+        for source in [
+            Path(inspect.getfile(type(self))),
+            Path(__file__),
+            *sorted(Path(Path(__file__).parent, "utils").glob("*.py")),
+        ]:
+            digest.update(source.read_bytes())
+        return Path(
+            PARSE_CACHE_DIR,
+            f"{self._parse_cache_prefix(name)}{digest.hexdigest()[:16]}.pickle",
+        )
+
+    @final
+    def _write_parse_cache(self, name: str, cache_path: Path, result: Any):
+        """
+        Writes the pickle atomically (so an interrupted or concurrent run can't leave a
+        truncated file behind) and removes the ones from older inputs or sources.
+        """
+        cache_path.parent.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=cache_path.parent, suffix=".tmp", delete=False
+        ) as f:
+            f.write(pickle.dumps(result))
+        Path(f.name).replace(cache_path)
+
+        for stale in cache_path.parent.glob(
+            f"{self._parse_cache_prefix(name)}*.pickle"
+        ):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+
+    @final
+    def _run_parse_once(self, func: Callable[[Any], Any]) -> Any:
+        name = func.__name__
+        if name in self._parsed:
+            return self._parsed[name]
+
+        if not self.persist_parsed_input:
+            result = func(self)
+        else:
+            cache_path = self._parse_cache_path(name)
+            try:
+                result = pickle.loads(cache_path.read_bytes())
+            except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+                # not cached yet, or the file is damaged: parse again and (re)write it
+                result = func(self)
+                self._write_parse_cache(name, cache_path, result)
+
+        self._parsed[name] = result
+        return result
+
     @final
     def run_and_print_solutions(self):
         result = self.solve()
@@ -217,6 +400,40 @@ class IntSplitSolution(BaseSolution[list[int]]):
     input_type = InputTypes.INTSPLIT
 
 
+class LineStreamSolution(BaseSolution[LineStream]):
+    """
+    input is a lazily-read str[] of lines; iterate it as often as you like, but don't index it
+    """
+
+    input_type = InputTypes.LINES_STREAM
+
+
+class BytesMmapSolution(BaseSolution[mmap.mmap]):
+    """
+    input is a read-only mmap of the file's raw bytes, which can be sliced, searched, or
+    wrapped in a memoryview. Unlike the other types, leading and trailing newlines are kept
+    """
+
+    input_type = InputTypes.BYTES_MMAP
+
+
+class CharGridSolution(BaseSolution["NDArray[np.uint8]"]):
+    """
+    input is a 2-D numpy array of the bytes in a rectangular block of text; compare cells
+    against `ord("#")` and friends. Requires numpy
+    """
+
+    input_type = InputTypes.CHARGRID
+
+
+class IntGridSolution(BaseSolution["NDArray[np.int64]"]):
+    """
+    input is a 2-D numpy array of int64, from a rectangular block of digits. Requires numpy
+    """
+
+    input_type = InputTypes.INTGRID
+
+
 # https://stackoverflow.com/a/65681955/1825390
 SolutionClassType = TypeVar("SolutionClassType", bound=BaseSolution)
 
@@ -309,3 +526,29 @@ def answer(
         return wrapper
 
     return deco
+
+
+def parse_once(
+    func: Callable[[SolutionClassType], R],
+) -> Callable[[SolutionClassType], R]:
+    """
+    A decorator for a solution method that turns `self.input` into a more useful structure.
+    The method only runs once per Solution; later calls (e.g. from the other part) get the
+    same object back, so don't mutate it.
+
+    If the Solution sets `persist_parsed_input = True`, the result is also pickled into
+    `.parse_cache/`, keyed by a hash of the input file and the solution's source.
+
+    Usage:
+    ```py
+    @parse_once
+    def parse(self) -> list[Thing]:
+        return [Thing(line) for line in self.input]
+    ```
+    """
+
+    @wraps(func)
+    def wrapper(self: SolutionClassType) -> R:
+        return self._run_parse_once(func)
+
+    return wrapper
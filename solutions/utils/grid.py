@@ -1,24 +1,69 @@
-from typing import Generic, List, Tuple, TypeVar
+from functools import cached_property
+from typing import Generic, List, Sequence, Tuple, TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
 
 type Position = Tuple[int, int]
 
 T = TypeVar("T")
 
 DIRECTIONS: List[Position] = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+# the 4 directions above, then the diagonals
+DIRECTIONS_8: List[Position] = [*DIRECTIONS, (-1, 1), (1, 1), (1, -1), (-1, -1)]
 
 
 class Grid(Generic[T]):
-    def __init__(self, lines: List[List[T]]):
-        self.values = lines
+    """
+    A rectangular grid, stored as one flat, row-major list of cells.
+
+    Cells can be addressed by (row, col) Position, or by their index into the flat list,
+    which avoids building tuples in hot loops. Neighbour lookups come from tables that
+    are computed once, and the bulk methods (`neighbours_equal_mask` etc) work on whole
+    numpy arrays at a time.
+    """
+
+    def __init__(self, lines: Sequence[Sequence[T]]):
         self.height = len(lines)
         self.width = len(lines[0])
+        # private, so that every write goes through __setitem__ and keeps the caches right
+        self._cells: List[T] = [value for line in lines for value in line]
+
+    @property
+    def size(self) -> int:
+        return self.height * self.width
+
+    @property
+    def values(self) -> Sequence[Sequence[T]]:
+        """
+        The cells as rows. These are read-only tuples; assign to `grid[pos]` to change a
+        cell
+        """
+        return tuple(
+            tuple(self._cells[row * self.width : (row + 1) * self.width])
+            for row in range(self.height)
+        )
+
+    def index(self, pos: Position) -> int:
+        row, col = pos
+        return row * self.width + col
+
+    def position(self, index: int) -> Position:
+        return divmod(index, self.width)
 
     def positions(self):
         return ((row, col) for row in range(self.height) for col in range(self.width))
 
     def __getitem__(self, pos: Position) -> T:
         row, col = pos
-        return self.values[row][col]
+        return self._cells[row * self.width + col]
+
+    def __setitem__(self, pos: Position, value: T):
+        row, col = pos
+        self._cells[row * self.width + col] = value
+        # the bulk lookups are built from the values, so they're out of date now
+        for name in ("_array", "_codes"):
+            self.__dict__.pop(name, None)
 
     def _all_neighbouring_positions(self, pos: Position):
         row, col = pos
@@ -29,11 +74,90 @@ class Grid(Generic[T]):
         return row >= 0 and col >= 0 and row < self.height and col < self.width
 
     def legal_neighbouring_positions(self, pos: Position):
-        return (
-            p
-            for p in self._all_neighbouring_positions(pos)
-            if self.is_legal_position(p)
-        )
+        return [self._positions[i] for i in self._legal_neighbours[self.index(pos)]]
 
     def legal_neighbouring_positions_with_value(self, pos: Position, value: T):
-        return [p for p in self.legal_neighbouring_positions(pos) if self[p] == value]
+        cells = self._cells
+        return [
+            self._positions[i]
+            for i in self._legal_neighbours[self.index(pos)]
+            if cells[i] == value
+        ]
+
+    def legal_neighbour_indices(self, index: int) -> Tuple[int, ...]:
+        """The flat indices of the (4-connected) neighbours of a cell that are on the grid"""
+        return self._legal_neighbours[index]
+
+    def legal_neighbour_indices_with_value(self, index: int, value: T) -> List[int]:
+        cells = self._cells
+        return [i for i in self._legal_neighbours[index] if cells[i] == value]
+
+    def neighbour_table(self, connectivity: int = 4) -> NDArray[np.int64]:
+        """
+        An (height * width, connectivity) array holding the flat index of each cell's
+        neighbours, in DIRECTIONS (or DIRECTIONS_8) order, with -1 where that neighbour
+        would be off the grid
+        """
+        if connectivity == 4:
+            return self._neighbour_table_4
+        if connectivity == 8:
+            return self._neighbour_table_8
+        raise ValueError(f"connectivity must be 4 or 8, not {connectivity}")
+
+    def neighbours_equal_mask(self, connectivity: int = 4) -> NDArray[np.bool_]:
+        """
+        A (height, width, connectivity) boolean array saying, for each cell, which of its
+        neighbours exist and hold the same value as it does
+        """
+        codes = self._codes
+        mask = codes[self.neighbour_table(connectivity)] == codes[:-1, np.newaxis]
+        return mask.reshape(self.height, self.width, connectivity)
+
+    def positions_where(self, value: T) -> List[Position]:
+        """All the positions holding `value`, in row-major order"""
+        return [
+            self._positions[i] for i in np.flatnonzero(self._array == value).tolist()
+        ]
+
+    def count_where(self, value: T) -> int:
+        return int(np.count_nonzero(self._array == value))
+
+    @cached_property
+    def _positions(self) -> List[Position]:
+        return list(self.positions())
+
+    @cached_property
+    def _array(self) -> NDArray:
+        return np.array(self._cells)
+
+    @cached_property
+    def _codes(self) -> NDArray[np.int64]:
+        # small ints standing in for the values, so they can be compared in bulk. The
+        # extra -2 on the end means that indexing with -1 (off the grid) never matches
+        _, inverse = np.unique(self._array, return_inverse=True)
+        return np.append(inverse.astype(np.int64), -2)
+
+    def _build_neighbour_table(self, directions: List[Position]) -> NDArray[np.int64]:
+        rows, cols = np.divmod(np.arange(self.height * self.width), self.width)
+        table = np.empty((rows.size, len(directions)), dtype=np.int64)
+        for n, (dr, dc) in enumerate(directions):
+            r = rows + dr
+            c = cols + dc
+            legal = (r >= 0) & (c >= 0) & (r < self.height) & (c < self.width)
+            table[:, n] = np.where(legal, r * self.width + c, -1)
+        return table
+
+    @cached_property
+    def _neighbour_table_4(self) -> NDArray[np.int64]:
+        return self._build_neighbour_table(DIRECTIONS)
+
+    @cached_property
+    def _neighbour_table_8(self) -> NDArray[np.int64]:
+        return self._build_neighbour_table(DIRECTIONS_8)
+
+    @cached_property
+    def _legal_neighbours(self) -> List[Tuple[int, ...]]:
+        return [
+            tuple(i for i in neighbours if i >= 0)
+            for neighbours in self._neighbour_table_4.tolist()
+        ]
@@ -0,0 +1,46 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List
+
+# each worker gets a few chunks, so one slow chunk doesn't leave the others idle
+CHUNKS_PER_WORKER = 4
+
+
+def chunked[T](items: List[T], chunk_count: int) -> List[List[T]]:
+    """Deals the items out into `chunk_count` lists, round-robin"""
+    return [items[i::chunk_count] for i in range(chunk_count)]
+
+
+def worker_count() -> int:
+    """
+    How many processes a solution should spread its work over: one per CPU, unless it's
+    already running inside a worker process (e.g. under `advent --all`), whose pool has
+    already shared the CPUs out
+    """
+    if multiprocessing.parent_process() is not None:
+        return 1
+    return os.cpu_count() or 1
+
+
+def map_chunks[T, R](
+    func: Callable[[List[T]], R],
+    items: List[T],
+    initializer: Callable[..., Any] | None = None,
+    initargs: Iterable[Any] = (),
+) -> List[R]:
+    """
+    Calls `func` on chunks of the items across a process pool, returning each chunk's
+    result. `initializer(*initargs)` runs once in each worker first. With only one
+    worker, everything runs in this process instead.
+    """
+    workers = worker_count()
+    if workers == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(items)]
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=tuple(initargs)
+    ) as executor:
+        return list(executor.map(func, chunked(items, workers * CHUNKS_PER_WORKER)))
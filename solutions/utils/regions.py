@@ -0,0 +1,93 @@
+from typing import List, TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .grid import Grid
+
+T = TypeVar("T")
+
+# Indices into the 8-connected neighbour order of `grid.DIRECTIONS_8`
+# (N, E, S, W, NE, SE, SW, NW). Each corner of a cell is made of two orthogonal
+# neighbours and the diagonal one between them.
+CORNERS = [(0, 1, 4), (1, 2, 5), (2, 3, 6), (3, 0, 7)]
+
+
+class Regions:
+    """
+    The connected regions of equal values in a grid (4-connected).
+
+    `labels` holds each cell's region number, from 0 to `count - 1`, numbered in the
+    order their first cell is found (row-major). `areas`, `perimeters` and `sides` are
+    indexed by region number.
+    """
+
+    def __init__(
+        self,
+        labels: NDArray[np.int64],
+        areas: NDArray[np.int64],
+        perimeters: NDArray[np.int64],
+        sides: NDArray[np.int64],
+    ):
+        self.labels = labels
+        self.count = len(areas)
+        self.areas = areas
+        self.perimeters = perimeters
+        self.sides = sides
+
+
+def label_regions(grid: Grid[T]) -> Regions:
+    """
+    Labels the regions of a grid with an iterative flood fill (so large regions can't
+    hit the recursion limit), then measures all of them at once.
+
+    A region's perimeter is the number of cell edges not shared with the same region.
+    Its number of sides (straight runs of fence) equals its number of corners, which are
+    counted per cell: a convex corner has neither orthogonal neighbour in the region;
+    a concave one has both, but not the diagonal between them.
+    """
+    size = grid.height * grid.width
+    same4 = grid.neighbours_equal_mask(4).reshape(size, 4)
+    same8 = grid.neighbours_equal_mask(8).reshape(size, 8)
+
+    # flat index lists are much quicker than numpy for the cell-by-cell fill
+    same_neighbours = [
+        [i for (i, same) in zip(neighbours, is_same) if same]
+        for (neighbours, is_same) in zip(
+            grid.neighbour_table(4).tolist(), same4.tolist()
+        )
+    ]
+
+    labels: List[int] = [-1] * size
+    count = 0
+    for start in range(size):
+        if labels[start] >= 0:
+            continue
+
+        labels[start] = count
+        stack = [start]
+        while stack:
+            for neighbour in same_neighbours[stack.pop()]:
+                if labels[neighbour] < 0:
+                    labels[neighbour] = count
+                    stack.append(neighbour)
+        count += 1
+
+    label_array = np.array(labels, dtype=np.int64)
+
+    cell_perimeters = 4 - same4.sum(axis=1)
+    cell_corners = sum(
+        (~same8[:, a] & ~same8[:, b]) | (same8[:, a] & same8[:, b] & ~same8[:, diag])
+        for (a, b, diag) in CORNERS
+    )
+
+    return Regions(
+        labels=label_array.reshape(grid.height, grid.width),
+        areas=np.bincount(label_array, minlength=count),
+        perimeters=np.bincount(
+            label_array, weights=cell_perimeters, minlength=count
+        ).astype(np.int64),
+        sides=np.bincount(label_array, weights=cell_corners, minlength=count).astype(
+            np.int64
+        ),
+    )